@@ -1,19 +1,20 @@
-# autogenerate start
-from . import day01 as day01
-from . import day02 as day02
-from . import day03 as day03
-from . import day04 as day04
-from . import day05 as day05
-from . import day06 as day06
-from . import day07 as day07
-from . import day08 as day08
-from . import day09 as day09
-from . import day10 as day10
-from . import day11 as day11
-from . import day12 as day12
-from . import day13 as day13
-from . import day14 as day14
-from . import day15 as day15
-from . import day16 as day16
+from ._registry import solvers as _solvers
 
+# autogenerate start
+_solvers.modules[1] = "day01"
+_solvers.modules[2] = "day02"
+_solvers.modules[3] = "day03"
+_solvers.modules[4] = "day04"
+_solvers.modules[5] = "day05"
+_solvers.modules[6] = "day06"
+_solvers.modules[7] = "day07"
+_solvers.modules[8] = "day08"
+_solvers.modules[9] = "day09"
+_solvers.modules[10] = "day10"
+_solvers.modules[11] = "day11"
+_solvers.modules[12] = "day12"
+_solvers.modules[13] = "day13"
+_solvers.modules[14] = "day14"
+_solvers.modules[15] = "day15"
+_solvers.modules[16] = "day16"
 # autogenerate end
@@ -1,17 +1,51 @@
 import datetime as dt
 import os
 import re
+import sys
+from collections.abc import Callable
 from pathlib import Path
-from typing import IO
+from typing import IO, TYPE_CHECKING, Any
 
 import click
-import httpx
-import isort
-from dotenv import load_dotenv
 
-from ._registry import solvers
+from ._registry import BACKENDS, read_input, solve_input, solvers
+
+if TYPE_CHECKING:
+    from ._cache import ResultCache
+    from ._registry import InputBuffer
+
+# Commands import their dependencies when they run, so that the CLI starts
+# quickly. Check with `aoc2023 perf startup`.
+
+BASE_URL = "https://adventofcode.com"
+INPUT_DIR = Path("input")
+ANSWERS_FILE = INPUT_DIR / "answers.json"
+STATE_DIR = Path(".aoc2023")
+
+
+def input_path(day: int) -> Path:
+    return INPUT_DIR / f"{day:02d}.txt"
+
+
+base_url_option = click.option(
+    "--base-url",
+    default=BASE_URL,
+    show_default=True,
+    envvar="AOC_BASE_URL",
+    help="Advent of Code server to download inputs from.",
+)
+
 
-INPUT_URL = "https://adventofcode.com/2023/day/{day}/input"
+def aoc_session() -> str:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    try:
+        return os.environ["AOC_SESSION"]
+    except KeyError:
+        raise click.UsageError(
+            "Set AOC_SESSION environment variable (or add to .env file)"
+        )
 
 
 @click.group(context_settings=dict(help_option_names=["-h", "--help"]))
@@ -22,16 +56,15 @@ def cli() -> None:
 @cli.command()
 @click.argument("day", type=click.IntRange(min=1, max=25))
 @click.argument("file", type=click.File("x"))
-def download(day: int, file: IO[str]) -> None:
+@base_url_option
+def download(day: int, file: IO[str], base_url: str) -> None:
     """Download input for DAY to FILE. Will not overwrite."""
-    load_dotenv()
-    try:
-        cookies = dict(session=os.environ["AOC_SESSION"])
-    except KeyError:
-        raise click.UsageError(
-            "Set AOC_SESSION environment variable (or add to .env file)"
-        )
-    response = httpx.get(INPUT_URL.format(day=day), cookies=cookies)
+    import httpx
+
+    from ._download import input_url
+
+    cookies = dict(session=aoc_session())
+    response = httpx.get(input_url(base_url, day), cookies=cookies)
     response.raise_for_status()
     file.write(response.text)
 
@@ -47,18 +80,228 @@ verbose = click.option(
 )
 
 
+def cache_options[F: Callable[..., Any]](fn: F) -> F:
+    fn = click.option(
+        "--no-cache",
+        "use_cache",
+        is_flag=True,
+        flag_value=False,
+        default=True,
+        help="Always run the solver, ignoring and not updating the result cache.",
+    )(fn)
+    fn = click.option(
+        "--cache-size",
+        type=click.IntRange(min=0),
+        default=64,
+        show_default=True,
+        envvar="AOC_CACHE_SIZE",
+        help="Maximum size of the result cache, in MiB.",
+    )(fn)
+    return fn
+
+
+backend_option = click.option(
+    "--backend",
+    type=click.Choice(BACKENDS),
+    help=(
+        "Solver implementation to use. Falls back to the day's default (the "
+        "fastest available) if the day doesn't have it."
+    ),
+)
+
+
+def resolve_backend(day: int, backend: str | None) -> str | None:
+    """Return the backend that will be used for day, warning if it isn't the
+    one asked for. Returns None if no backend was asked for.
+    """
+    if backend is None:
+        return None
+    resolved = solvers.resolve(day, backend)
+    if resolved != backend:
+        click.secho(
+            f"Day {day} has no {backend} backend, using {resolved}",
+            fg="yellow",
+            err=True,
+        )
+    return resolved
+
+
+def result_cache(use_cache: bool, cache_size: int) -> "ResultCache | None":
+    from ._cache import ResultCache
+
+    if not use_cache:
+        return None
+    return ResultCache(STATE_DIR / "cache", max_bytes=cache_size * 1024 * 1024)
+
+
+def profile_options[F: Callable[..., Any]](fn: F) -> F:
+    fn = click.option(
+        "--profile",
+        type=click.Choice(["cprofile", "stats"]),
+        is_flag=False,
+        flag_value="cprofile",
+        help=(
+            "Profile the solver (bypasses the cache). cprofile is deterministic, "
+            "stats samples the stack periodically."
+        ),
+    )(fn)
+    fn = click.option(
+        "--profile-top",
+        type=click.IntRange(min=1),
+        default=20,
+        show_default=True,
+        help="Number of hot functions or allocation sites to print.",
+    )(fn)
+    fn = click.option(
+        "--prof-file",
+        type=click.Path(dir_okay=False, writable=True, path_type=Path),
+        help="Write cProfile stats to this .prof file (--profile=cprofile).",
+    )(fn)
+    fn = click.option(
+        "--flamegraph",
+        type=click.File("w"),
+        help="Write collapsed stacks for flamegraph tools (--profile=stats).",
+    )(fn)
+    fn = click.option(
+        "--memory",
+        is_flag=True,
+        help=(
+            "Report peak memory and top allocation sites using tracemalloc "
+            "(bypasses the cache)."
+        ),
+    )(fn)
+    fn = click.option(
+        "--trace",
+        type=click.File("w"),
+        help=(
+            "Write solver phases and counters to this file in Chrome trace "
+            "format (bypasses the cache)."
+        ),
+    )(fn)
+    return fn
+
+
+def solve_day(
+    day: int,
+    data: "InputBuffer",
+    *,
+    verbose: int,
+    use_cache: bool,
+    cache_size: int,
+    profile: str | None,
+    profile_top: int,
+    prof_file: Path | None,
+    flamegraph: IO[str] | None,
+    memory: bool,
+    trace: IO[str] | None,
+    backend: str | None,
+) -> None:
+    from ._cache import run_cached
+
+    if day not in solvers:
+        raise click.UsageError("Unimplemented!")
+
+    backend = resolve_backend(day, backend)
+
+    if profile is None and (prof_file is not None or flamegraph is not None):
+        raise click.UsageError("--prof-file and --flamegraph require --profile")
+
+    if memory and profile is not None:
+        raise click.UsageError("--memory and --profile can't be used together")
+
+    if not memory and profile is None and trace is None:
+        cache = result_cache(use_cache, cache_size)
+        run_cached(cache, day, data, verbose, backend)
+        return
+
+    # Import the solver's module first so that it isn't measured
+    solvers[day]
+
+    if memory:
+        from ._memory import report_memory
+
+        report_memory(
+            solve_input,
+            day,
+            data,
+            verbose,
+            backend,
+            top=profile_top,
+            stream=sys.stderr,
+        )
+        return
+
+    if trace is not None:
+        from ._util import span, tracing
+
+        with tracing() as tracer, span(f"day {day}"):
+            run_profiled(
+                day, data, verbose, backend, profile, profile_top, prof_file, flamegraph
+            )
+        tracer.write(trace)
+    else:
+        run_profiled(
+            day, data, verbose, backend, profile, profile_top, prof_file, flamegraph
+        )
+
+
+def run_profiled(
+    day: int,
+    data: "InputBuffer",
+    verbose: int,
+    backend: str | None,
+    profile: str | None,
+    profile_top: int,
+    prof_file: Path | None,
+    flamegraph: IO[str] | None,
+) -> None:
+    from . import _profile
+
+    match profile:
+        case None:
+            solve_input(day, data, verbose, backend)
+        case "cprofile":
+            if flamegraph is not None:
+                raise click.UsageError("--flamegraph requires --profile=stats")
+            _profile.profile_deterministic(
+                solve_input,
+                day,
+                data,
+                verbose,
+                backend,
+                top=profile_top,
+                stream=sys.stderr,
+                prof_file=prof_file,
+            )
+        case "stats":
+            if prof_file is not None:
+                raise click.UsageError("--prof-file requires --profile=cprofile")
+            _profile.profile_sampling(
+                solve_input,
+                day,
+                data,
+                verbose,
+                backend,
+                top=profile_top,
+                stream=sys.stderr,
+                collapsed_file=flamegraph,
+            )
+
+
 @cli.command()
 @click.argument("day", type=click.IntRange(min=1, max=25))
-@click.argument("file", type=click.File("r"), default="-")
+@click.argument("file", type=click.File("rb"), default="-")
 @verbose
-def run(day: int, file: IO[str], verbose: int) -> None:
-    """If FILE is not passed, stdin is used instead."""
-    try:
-        solve = solvers[day]
-    except KeyError:
-        raise click.UsageError("Unimplemented!")
+@backend_option
+@cache_options
+@profile_options
+def run(day: int, file: IO[bytes], **kwargs: Any) -> None:
+    """If FILE is not passed, stdin is used instead.
 
-    solve(file, verbose)
+    Answers are cached by the input and solver source unless --no-cache is
+    given.
+    """
+    solve_day(day, read_input(file), **kwargs)
 
 
 def default_day() -> int:
@@ -78,20 +321,851 @@ def default_day() -> int:
 @cli.command()
 @click.argument("day", type=click.IntRange(min=1, max=25), default=default_day)
 @verbose
-def autorun(day: int, verbose: int) -> None:
+@backend_option
+@cache_options
+@profile_options
+def autorun(day: int, **kwargs: Any) -> None:
+    path = input_path(day)
     try:
-        solve = solvers[day]
-    except KeyError:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        raise click.UsageError(f"Input file does not exist: {path}")
+
+    with file:
+        solve_day(day, read_input(file), **kwargs)
+
+
+history_option = click.option(
+    "--history",
+    "history_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=STATE_DIR / "history.sqlite",
+    show_default=True,
+    envvar="AOC_HISTORY",
+    help="SQLite database of benchmark results.",
+)
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+@cli.command()
+@click.argument("days", nargs=-1, type=click.IntRange(min=1, max=25))
+@click.option("--warmup", default=1, show_default=True, help="Untimed runs per day.")
+@click.option(
+    "-n", "--repeat", default=5, show_default=True, type=click.IntRange(min=1)
+)
+@click.option(
+    "--json",
+    "json_file",
+    type=click.File("w"),
+    help="Write machine-readable results to this file.",
+)
+@click.option(
+    "--record",
+    is_flag=True,
+    help="Record results in the benchmark history, keyed by the current commit.",
+)
+@history_option
+@backend_option
+def bench(
+    days: tuple[int, ...],
+    warmup: int,
+    repeat: int,
+    json_file: IO[str] | None,
+    record: bool,
+    history_path: Path,
+    backend: str | None,
+) -> None:
+    """Benchmark the solvers for DAYS (default: all registered days).
+
+    Answers are checked against input/answers.json where present.
+    """
+    import json
+
+    from . import _bench, _history
+
+    if not days:
+        days = tuple(sorted(solvers))
+
+    expected_answers = _bench.load_answers(ANSWERS_FILE)
+    results = []
+    for day in days:
+        if day not in solvers:
+            raise click.UsageError(f"Day {day} is unimplemented!")
+
+        path = input_path(day)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise click.UsageError(f"Input file does not exist: {path}")
+
+        result = _bench.bench(
+            day,
+            data,
+            warmup=warmup,
+            repeat=repeat,
+            expected=expected_answers.get(day),
+            backend=resolve_backend(day, backend),
+        )
+        results.append(result)
+
+        wall = _bench.summarise(result.wall)
+        cpu = _bench.summarise(result.cpu)
+        match result.correct:
+            case True:
+                status = click.style("ok", fg="green")
+            case False:
+                status = click.style(
+                    f"WRONG {result.answers} != {result.expected}", fg="red"
+                )
+            case None:
+                status = click.style("unchecked", fg="yellow")
+        click.echo(
+            f"Day {day:2d} ({result.backend}): "
+            f"wall min={format_seconds(wall['min'])} "
+            f"median={format_seconds(wall['median'])} "
+            f"p95={format_seconds(wall['p95'])} | "
+            f"cpu median={format_seconds(cpu['median'])} "
+            f"[{status}]"
+        )
+
+    if json_file is not None:
+        json.dump(
+            dict(
+                warmup=warmup,
+                repeat=repeat,
+                results=[result.to_json() for result in results],
+            ),
+            json_file,
+            indent=2,
+        )
+
+    if any(result.correct is False for result in results):
+        raise SystemExit(1)
+
+    if record:
+        commit = _history.resolve_commit()
+        if _history.working_tree_dirty():
+            click.secho(
+                f"Warning: working tree has uncommitted changes, recording "
+                f"results against {commit[:12]} anyway",
+                fg="yellow",
+            )
+        with _history.History(history_path) as history:
+            history.record(
+                results,
+                commit=commit,
+                python=_history.python_version(),
+                rust=any(result.backend == "rust" for result in results),
+            )
+        click.echo(f"Recorded results for {commit[:12]} in {history_path}")
+
+
+@cli.group()
+def perf() -> None:
+    """Inspect performance and the benchmark history."""
+
+
+def default_python_version() -> str:
+    from ._history import python_version
+
+    return python_version()
+
+
+@perf.command()
+@click.argument("base")
+@click.argument("head", default="HEAD")
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.05,
+    show_default=True,
+    help="Minimum relative slowdown of the median to report, e.g. 0.05 for 5%.",
+)
+@click.option(
+    "--alpha",
+    type=click.FloatRange(min=0, max=1),
+    default=0.05,
+    show_default=True,
+    help="Significance level for the Mann-Whitney U test.",
+)
+@click.option(
+    "--python",
+    "python",
+    default=default_python_version,
+    help="Python version to compare (default: this interpreter).",
+)
+@click.option(
+    "--backend",
+    type=click.Choice(BACKENDS),
+    help="Only compare this backend (default: every backend recorded for both).",
+)
+@history_option
+def compare(
+    base: str,
+    head: str,
+    threshold: float,
+    alpha: float,
+    python: str,
+    backend: str | None,
+    history_path: Path,
+) -> None:
+    """Compare recorded timings of BASE against HEAD (git revisions).
+
+    Each day is compared on the backends it was benchmarked with in both.
+    Exits with status 1 if any day has a significant slowdown.
+    """
+    from . import _history
+
+    base_commit = _history.resolve_commit(base)
+    head_commit = _history.resolve_commit(head)
+    with _history.History(history_path) as history:
+        base_samples = history.samples(
+            commit=base_commit, python=python, backend=backend
+        )
+        head_samples = history.samples(
+            commit=head_commit, python=python, backend=backend
+        )
+
+    for rev, samples in [(base, base_samples), (head, head_samples)]:
+        if not samples:
+            raise click.UsageError(f"No recorded benchmarks for {rev}")
+
+    comparisons = _history.compare(
+        base_samples, head_samples, threshold=threshold, alpha=alpha
+    )
+    if not comparisons:
+        raise click.UsageError(f"No days in common between {base} and {head}")
+
+    for comparison in comparisons:
+        line = (
+            f"Day {comparison.day:2d} ({comparison.backend}): "
+            f"{format_seconds(comparison.base_median)} -> "
+            f"{format_seconds(comparison.head_median)} "
+            f"({comparison.change:+.1%}, p={comparison.p_value:.3f})"
+        )
+        if comparison.regression:
+            click.secho(f"{line} REGRESSION", fg="red")
+        else:
+            click.echo(line)
+
+    if any(comparison.regression for comparison in comparisons):
+        raise SystemExit(1)
+
+
+@perf.command()
+@click.argument("args", nargs=-1)
+@click.option(
+    "--budget",
+    type=click.FloatRange(min=0),
+    default=100,
+    show_default=True,
+    envvar="AOC_IMPORT_BUDGET",
+    help="Maximum total import time, in milliseconds.",
+)
+@click.option(
+    "-n",
+    "--repeat",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Number of runs, the fastest is used.",
+)
+@click.option("--top", default=10, show_default=True, help="Slowest imports to list.")
+def startup(args: tuple[str, ...], budget: float, repeat: int, top: int) -> None:
+    """Check the import time of `aoc2023 ARGS` (default: run --help).
+
+    Uses `python -X importtime` and exits with status 1 if the total import
+    time exceeds the budget. Separate ARGS with -- if they contain options,
+    e.g. `aoc2023 perf startup -- autorun --help`.
+    """
+    import subprocess
+
+    from ._bench import parse_importtime
+
+    if not args:
+        args = ("run", "--help")
+
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "aoc2023", *args],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise click.ClickException(
+                f"aoc2023 {' '.join(args)} failed:\n{result.stderr}"
+            )
+        imports = parse_importtime(result.stderr)
+        total = sum(imp.cumulative for imp in imports if imp.depth == 0)
+        if best is None or total < best[0]:
+            best = total, imports
+
+    assert best is not None
+    total, imports = best
+    top_level = sorted(
+        (imp for imp in imports if imp.depth == 0),
+        key=lambda imp: imp.cumulative,
+        reverse=True,
+    )
+    for imp in top_level[:top]:
+        click.echo(f"{format_seconds(imp.cumulative):>10} {imp.name}")
+
+    line = f"Total import time {format_seconds(total)} (budget {budget:g}ms)"
+    if total * 1000 > budget:
+        click.secho(line, fg="red")
+        raise SystemExit(1)
+    click.secho(line, fg="green")
+
+
+@perf.command()
+@click.argument("names", nargs=-1)
+@click.option(
+    "-n", "--repeat", default=20, show_default=True, type=click.IntRange(min=1)
+)
+def micro(names: tuple[str, ...], repeat: int) -> None:
+    """Run microbenchmarks of the hot loops in _util (default: all of them).
+
+    Each loop is timed with the current implementation and the one it
+    replaced.
+    """
+    from . import _micro
+
+    for name in names:
+        if name not in _micro.microbenchmarks:
+            raise click.UsageError(
+                f"Unknown microbenchmark {name!r}, choose from: "
+                + ", ".join(_micro.microbenchmarks)
+            )
+
+    for name in names or _micro.microbenchmarks:
+        times = _micro.run(name, repeat=repeat)
+        baseline, *_, current = times.values()
+        click.echo(
+            f"{name}: "
+            + " ".join(f"{label}={format_seconds(t)}" for label, t in times.items())
+            + f" ({baseline / current:.2f}x)"
+        )
+
+
+@cli.command("run-all")
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=os.cpu_count,
+    help="Number of worker processes (default: number of CPUs).",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=60,
+    show_default=True,
+    help="Time limit per day, in seconds.",
+)
+@click.option(
+    "--memory-limit",
+    type=click.IntRange(min=1),
+    default=4096,
+    show_default=True,
+    help="Address space limit per worker, in MiB.",
+)
+@history_option
+@verbose
+@cache_options
+def run_all(
+    jobs: int,
+    timeout: float,
+    memory_limit: int,
+    history_path: Path,
+    verbose: int,
+    use_cache: bool,
+    cache_size: int,
+) -> None:
+    """Run every registered day in parallel.
+
+    Days are scheduled longest-first using the times of the last run-all (or
+    the benchmark history), and their output is printed in day order. A day
+    which outlives its timeout, or whose worker dies, is reported as failed.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from . import _cache, _history, _runall
+
+    days = [day for day in sorted(solvers) if input_path(day).exists()]
+    for day in sorted(solvers.keys() - days):
+        click.secho(
+            f"Skipping day {day}: {input_path(day)} does not exist", fg="yellow"
+        )
+
+    with _history.History(history_path) as history:
+        # Prefer run-all's own times over benchmarks, which don't include
+        # starting up
+        runtimes = history.latest_medians() | history.runtimes()
+
+    cache = None if verbose else result_cache(use_cache, cache_size)
+    cache_keys = {}
+    cached_outputs = {}
+    if cache is not None:
+        for day in days:
+            key = _cache.cache_key(day, input_path(day).read_bytes())
+            cache_keys[day] = key
+            if (output := cache.get(key)) is not None:
+                cached_outputs[day] = output
+
+    failed = False
+    hung = False
+    elapsed = {}
+    executor = ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_runall.init_worker,
+        initargs=(memory_limit * 1024 * 1024,),
+    )
+    try:
+        futures = {
+            day: executor.submit(
+                _runall.run_day, day, input_path(day), verbose, timeout
+            )
+            for day in _runall.schedule(days, runtimes)
+            if day not in cached_outputs
+        }
+        for day in days:
+            if day in cached_outputs:
+                click.secho(f"Day {day} (cached)", fg="green", bold=True)
+                click.echo(cached_outputs[day], nl=False)
+                continue
+
+            future = futures[day]
+            result = _runall.wait_for_day(day, future, timeout)
+            if not future.done():
+                hung = True
+            # Days whose worker died weren't timed
+            if not (future.done() and future.exception() is not None):
+                elapsed[day] = result.elapsed
+            click.secho(
+                f"Day {day} ({format_seconds(result.elapsed)})", fg="green", bold=True
+            )
+            click.echo(result.output, nl=False)
+            if result.error is not None:
+                failed = True
+                click.secho(result.error.rstrip(), fg="red")
+            elif cache is not None:
+                cache.put(cache_keys[day], result.output)
+    finally:
+        if hung:
+            _runall.kill_workers(executor)
+        executor.shutdown(cancel_futures=True)
+
+    with _history.History(history_path) as history:
+        history.record_runtimes(elapsed)
+
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("day", type=click.IntRange(min=1, max=25))
+@click.argument("patterns", metavar="GLOB...", nargs=-1, required=True)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=os.cpu_count,
+    help="Number of worker processes (default: number of CPUs).",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=60,
+    show_default=True,
+    help="Time limit per file, in seconds.",
+)
+@click.option(
+    "--memory-limit",
+    type=click.IntRange(min=1),
+    default=4096,
+    show_default=True,
+    help="Address space limit per worker, in MiB.",
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="File to write JSON Lines results to (default: stdout).",
+)
+def batch(
+    day: int,
+    patterns: tuple[str, ...],
+    jobs: int,
+    timeout: float,
+    memory_limit: int,
+    output: IO[str],
+) -> None:
+    """Run the solver for DAY on every file matching GLOB.
+
+    Each worker process imports the solver once and is reused for many files.
+    One JSON object is written per file, in the order the files were given,
+    with the output that `run` would print for it. Throughput is reported on
+    stderr.
+    """
+    import json
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+
+    from . import _bench, _runall
+
+    if day not in solvers:
+        raise click.UsageError(f"Day {day} is unimplemented!")
+
+    paths = [path for path in _runall.expand_paths(patterns) if path.is_file()]
+    if not paths:
+        raise click.UsageError("No input files matched")
+
+    failed = 0
+    total_bytes = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_runall.init_batch_worker,
+        initargs=(day, memory_limit * 1024 * 1024),
+    ) as executor:
+        run = partial(_runall.run_day, day, verbose=0, timeout=timeout)
+        chunksize = max(1, len(paths) // (jobs * 16))
+        for path, result in zip(paths, executor.map(run, paths, chunksize=chunksize)):
+            size = path.stat().st_size
+            total_bytes += size
+            if result.error is not None:
+                failed += 1
+            record = dict(
+                file=str(path),
+                bytes=size,
+                answers=_bench.parse_answers(result.output),
+                output=result.output,
+                elapsed=result.elapsed,
+                error=result.error,
+            )
+            output.write(json.dumps(record) + "\n")
+    elapsed = time.perf_counter() - start
+
+    click.echo(
+        f"{len(paths)} files, {total_bytes / 1e6:.2f}MB in {format_seconds(elapsed)}: "
+        f"{len(paths) / elapsed:.1f} files/s, {total_bytes / 1e6 / elapsed:.2f}MB/s"
+        + (f", {failed} failed" if failed else ""),
+        err=True,
+    )
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("day", type=click.IntRange(min=1, max=25))
+@click.argument("file", type=click.File("rb"), required=False)
+@click.option(
+    "-n",
+    "--iterations",
+    type=click.IntRange(min=2),
+    default=20,
+    show_default=True,
+)
+@click.option(
+    "--max-growth",
+    type=click.FloatRange(min=0),
+    help="Exit with status 1 if memory grows more than this many KiB per iteration.",
+)
+@click.option("--top", default=10, show_default=True, help="Growing sites to list.")
+@verbose
+def soak(
+    day: int,
+    file: IO[bytes] | None,
+    iterations: int,
+    max_growth: float | None,
+    top: int,
+    verbose: int,
+) -> None:
+    """Run the solver for DAY repeatedly in one process, reporting memory
+    retained between iterations.
+
+    Uses FILE, or the input file for DAY if not passed. Solver output is
+    discarded.
+    """
+    from . import _bench, _memory
+
+    if day not in solvers:
         raise click.UsageError("Unimplemented!")
 
-    input_path = f"input/{day:02d}.txt"
+    if file is None:
+        path = input_path(day)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise click.UsageError(f"Input file does not exist: {path}")
+    else:
+        data = file.read()
+
+    def progress(i: int, retained: int, peak: int) -> None:
+        if verbose:
+            click.echo(
+                f"Iteration {i + 1}: retained={_memory.format_bytes(retained)} "
+                f"peak={_memory.format_bytes(peak)}"
+            )
+
+    result = _memory.soak(
+        lambda: _bench.run_captured(day, data),
+        iterations=iterations,
+        progress=progress,
+    )
+
+    click.echo(f"Peak memory: {_memory.format_bytes(max(result.peaks))}")
+    click.echo(
+        f"Retained after first iteration: {_memory.format_bytes(result.retained[0])}"
+    )
+    click.echo(
+        f"Retained after last iteration:  {_memory.format_bytes(result.retained[-1])}"
+    )
+    growth = result.growth_per_iteration
+    line = f"Growth per iteration: {_memory.format_bytes(growth)}"
+    exceeded = max_growth is not None and growth > max_growth * 1024
+    click.secho(line, fg="red" if exceeded else None)
+
+    if result.growth:
+        click.echo("\nTop growing allocation sites:")
+        _memory.print_top(result.growth, top, sys.stdout)
+
+    if exceeded:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("day", type=click.IntRange(min=1, max=25))
+@click.option(
+    "--scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1,
+    show_default=True,
+    help="Size relative to a real input.",
+)
+@click.option("--seed", default=0, show_default=True)
+@click.option("-o", "--output", type=click.File("w"), default="-")
+def gen(day: int, scale: float, seed: int, output: IO[str]) -> None:
+    """Generate a synthetic input for DAY.
+
+    The same seed and scale always give the same input.
+    """
+    from . import _generate
+
+    if day not in _generate.generators:
+        raise click.UsageError(f"No generator for day {day}")
+    output.write(_generate.generate(day, scale=scale, seed=seed))
+
+
+def parse_scales(ctx: click.Context, param: click.Parameter, value: str) -> list[float]:
     try:
-        file = open(input_path)
-    except FileNotFoundError:
-        raise click.UsageError(f"Input file does not exist: {input_path}")
+        scales = sorted({float(scale) for scale in value.split(",")})
+    except ValueError:
+        raise click.BadParameter("must be a comma-separated list of numbers")
+    if len(scales) < 2 or scales[0] <= 0:
+        raise click.BadParameter("must be at least two positive numbers")
+    return scales
+
+
+@cli.command()
+@click.argument("day", type=click.IntRange(min=1, max=25))
+@click.option(
+    "--scales",
+    default="0.25,0.5,1,2,4,8",
+    show_default=True,
+    callback=parse_scales,
+    help="Comma-separated input sizes relative to a real input.",
+)
+@click.option("--seed", default=0, show_default=True)
+@click.option(
+    "-n", "--repeat", default=3, show_default=True, type=click.IntRange(min=1)
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=10,
+    show_default=True,
+    help="Stop at the first scale taking longer than this many seconds per run.",
+)
+@backend_option
+def scaling(
+    day: int,
+    scales: list[float],
+    seed: int,
+    repeat: int,
+    timeout: float,
+    backend: str | None,
+) -> None:
+    """Time the solver for DAY on generated inputs of increasing size.
+
+    Fits the empirical complexity of the solver, as time against input size in
+    bytes.
+    """
+    from . import _bench, _generate, _runall
+
+    if day not in solvers:
+        raise click.UsageError(f"Day {day} is unimplemented!")
+    if day not in _generate.generators:
+        raise click.UsageError(f"No generator for day {day}")
+
+    # Import the solver before timing
+    backend = solvers.resolve(day, resolve_backend(day, backend))
+    click.echo(f"Backend: {backend}")
+    sizes = []
+    times = []
+    for scale in scales:
+        data = _generate.generate(day, scale=scale, seed=seed).encode()
+        try:
+            with _runall.time_limit(timeout * repeat):
+                wall = min(
+                    _bench.run_captured(day, data, backend=backend)[0]
+                    for _ in range(repeat)
+                )
+        except _runall.SolverTimeout:
+            click.secho(f"Scale {scale:g}: timed out, stopping", fg="yellow")
+            break
+        sizes.append(len(data))
+        times.append(wall)
+        click.echo(
+            f"Scale {scale:>6g}: {len(data):>10d} bytes {format_seconds(wall):>10}"
+        )
+
+    if len(sizes) < 2:
+        raise click.ClickException("Not enough sizes completed to fit")
+    exponent = _generate.fit_exponent(sizes, times)
+    model = _generate.best_model(sizes, times)
+    click.echo(f"\nTime ~ n^{exponent:.2f}, best fit {model}")
 
-    with file as fp:
-        solve(fp, verbose)
+
+@cli.command()
+@click.argument("day", type=click.IntRange(min=1, max=25))
+@click.argument("file", type=click.File("rb"), required=False)
+def parity(day: int, file: IO[bytes] | None) -> None:
+    """Check that every backend for DAY gives the same answers.
+
+    Uses FILE, or the input file for DAY if not passed. Exits with status 1 if
+    any answers differ.
+    """
+    from . import _bench
+
+    if day not in solvers:
+        raise click.UsageError(f"Day {day} is unimplemented!")
+
+    if file is None:
+        path = input_path(day)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            raise click.UsageError(f"Input file does not exist: {path}")
+    else:
+        data = file.read()
+
+    backends = solvers.backends(day)
+    if len(backends) == 1:
+        click.secho(f"Day {day} only has the {backends[0]} backend", fg="yellow")
+
+    results = {}
+    for backend in backends:
+        wall, _, output = _bench.run_captured(day, data, backend=backend)
+        results[backend] = _bench.parse_answers(output)
+        click.echo(f"{backend:>8}: {format_seconds(wall):>10}  {results[backend]}")
+
+    reference = results[backends[-1]]
+    mismatched = [b for b, answers in results.items() if answers != reference]
+    if mismatched:
+        click.secho(
+            f"Answers from {', '.join(mismatched)} differ from {backends[-1]}",
+            fg="red",
+        )
+        raise SystemExit(1)
+    click.secho("All backends agree", fg="green")
+
+
+socket_option = click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=STATE_DIR / "solver.sock",
+    show_default=True,
+    envvar="AOC_SOCKET",
+    help="Unix domain socket of the solver daemon.",
+)
+
+
+@cli.command()
+@socket_option
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=os.cpu_count,
+    help="Number of worker processes (default: number of CPUs).",
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=60,
+    show_default=True,
+    help="Time limit per request, in seconds.",
+)
+@click.option(
+    "--memory-limit",
+    type=click.IntRange(min=1),
+    default=4096,
+    show_default=True,
+    help="Address space limit per worker, in MiB.",
+)
+def serve(socket_path: Path, jobs: int, timeout: float, memory_limit: int) -> None:
+    """Serve solver requests from `aoc2023 client` over a Unix domain socket.
+
+    Every registered solver is imported up front by a pool of worker
+    processes, so requests don't pay for starting Python.
+    """
+    from . import _server
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        server = _server.SolverServer(
+            socket_path,
+            jobs=jobs,
+            timeout=timeout,
+            memory_limit=memory_limit * 1024 * 1024,
+        )
+    except _server.ServerRunning as exc:
+        raise click.ClickException(str(exc))
+    with server:
+        click.echo(f"Serving {len(solvers)} solvers on {socket_path}", err=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+@cli.command()
+@click.argument("day", type=click.IntRange(min=1, max=25))
+@click.argument("file", type=click.File("rb"), default="-")
+@socket_option
+def client(day: int, file: IO[bytes], socket_path: Path) -> None:
+    """Solve DAY with FILE (default: stdin) using `aoc2023 serve`."""
+    from . import _server
+
+    try:
+        with _server.Client(socket_path) as solver:
+            result = solver.solve(day, file.read())
+    except (FileNotFoundError, ConnectionRefusedError):
+        raise click.ClickException(f"No server listening on {socket_path}")
+    click.echo(result.output, nl=False)
+    if result.error is not None:
+        click.secho(result.error.rstrip(), fg="red", err=True)
+        raise SystemExit(1)
 
 
 MODULE_TEMPLATE = """\
@@ -107,9 +1181,35 @@ def solve(file: IO[str], verbose: int) -> None:
 
 
 @cli.command()
-def prepare() -> None:
-    load_dotenv()
-    input_dir = Path("input")
+@base_url_option
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="Maximum concurrent downloads.",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=3,
+    show_default=True,
+    help="Retries for network errors and transient server errors.",
+)
+def prepare(base_url: str, jobs: int, retries: int) -> None:
+    """Create modules and download inputs for every available day.
+
+    Downloads are cached with their ETag and Last-Modified headers, so inputs
+    which haven't changed since the last run aren't downloaded again. Existing
+    input files are never overwritten. If any day fails to download, the
+    others are still written and the exit status is non-zero.
+    """
+    import asyncio
+
+    from . import _download
+
+    input_dir = INPUT_DIR
     package_dir = Path(__file__).parent
     expected_src_dir = package_dir.parent
     expected_root_dir = expected_src_dir.parent
@@ -127,37 +1227,46 @@ def prepare() -> None:
 
     last_available_day = min(dt.date.today(), dt.date(2023, 12, 25)).day
 
-    try:
-        aoc_session = os.environ["AOC_SESSION"]
-    except KeyError:
-        raise click.UsageError(
-            "Set AOC_SESSION environment variable (or add to .env file)"
+    session = aoc_session()
+    days = list(range(1, last_available_day + 1))
+
+    if create_modules:
+        for day in days:
+            module_file = package_dir / f"day{day:02d}.py"
+            try:
+                with open(module_file, "x") as file:
+                    file.write(MODULE_TEMPLATE.format(day=day))
+            except FileExistsError:
+                pass
+
+    downloads = asyncio.run(
+        _download.fetch_inputs(
+            days,
+            session=session,
+            base_url=base_url,
+            cache=_download.InputCache(STATE_DIR / "inputs", session),
+            concurrency=jobs,
+            retries=retries,
         )
-    else:
-        cookies = dict(session=aoc_session)
-
-    with httpx.Client(cookies=cookies) as client:
-        for day in range(1, last_available_day + 1):
-            if create_modules:
-                module_file = package_dir / f"day{day:02d}.py"
-                try:
-                    with open(module_file, "x") as file:
-                        file.write(MODULE_TEMPLATE.format(day=day))
-                except FileExistsError:
-                    pass
-
-            input_file = input_dir / f"{day:02d}.txt"
-            response = client.get(INPUT_URL.format(day=day))
-            if response.status_code == 200:
-                try:
-                    with open(input_file, "x") as file:
-                        file.write(response.text)
-                except FileExistsError:
-                    pass
-            elif response.status_code == 404:
-                print("Input is not available yet.")
-            else:
-                response.raise_for_status()
+    )
+    failed = []
+    for download in downloads:
+        if download.status is _download.Status.FAILED:
+            failed.append(download.day)
+            click.secho(
+                f"Day {download.day:2d}: {download.status.value} ({download.error})",
+                fg="red",
+            )
+            continue
+        click.echo(f"Day {download.day:2d}: {download.status.value}")
+        if download.text is None:
+            continue
+        input_file = input_dir / f"{download.day:02d}.txt"
+        try:
+            with open(input_file, "x") as file:
+                file.write(download.text)
+        except FileExistsError:
+            pass
 
     if create_modules:
         with open(package_dir / "__init__.py", "r+") as file:
@@ -176,14 +1285,15 @@ def prepare() -> None:
                 if re.match(r"# autogenerate start", line):
                     in_autogenerate = True
                     for day in range(1, last_available_day + 1):
-                        submod = f"day{day:02d}"
-                        output.append(f"from . import {submod} as {submod}\n")
-                    output.append("\n")
+                        output.append(f'_solvers.modules[{day}] = "day{day:02d}"\n')
 
             file.seek(0)
             file.truncate()
-            config = isort.Config(settings_path=os.getcwd())
-            file.write(isort.code("".join(output), config=config))
+            file.write("".join(output))
+
+    if failed:
+        click.secho(f"Failed to download days {', '.join(map(str, failed))}", fg="red")
+        raise SystemExit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+import io
+import json
+import re
+import statistics
+import time
+from collections.abc import Sequence
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Any
+
+from attrs import define
+
+from ._registry import InputBuffer, solve_input, solvers
+
+re_answer = re.compile(r"^Part (\d+): (.*)$", re.MULTILINE)
+
+
+def parse_answers(output: str) -> list[str]:
+    """Return the answers printed as ``Part N: <answer>`` lines, in order."""
+    return [match[2].strip() for match in re_answer.finditer(output)]
+
+
+def load_answers(path: Path) -> dict[int, list[str]]:
+    try:
+        with open(path) as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return {}
+    return {int(day): [str(a) for a in answers] for day, answers in data.items()}
+
+
+def percentile(samples: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(samples)
+    rank = max(1, round(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarise(samples: Sequence[float]) -> dict[str, float]:
+    return dict(
+        min=min(samples),
+        median=statistics.median(samples),
+        p95=percentile(samples, 95),
+    )
+
+
+@define
+class Import:
+    name: str
+    depth: int
+    self_time: float
+    cumulative: float
+
+
+def parse_importtime(stderr: str) -> list[Import]:
+    """Parse the output of `python -X importtime`, times are in seconds."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            # header
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append(
+            Import(
+                name.strip(),
+                depth,
+                int(self_us) / 1_000_000,
+                int(cumulative_us) / 1_000_000,
+            )
+        )
+    return imports
+
+
+def run_captured(
+    day: int, data: InputBuffer, verbose: int = 0, backend: str | None = None
+) -> tuple[float, float, str]:
+    """Run day's solver on data with stdout captured.
+
+    Returns (wall time, CPU time, output).
+    """
+    output = io.StringIO()
+    with redirect_stdout(output):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        solve_input(day, data, verbose, backend)
+        cpu = time.process_time() - cpu_start
+        wall = time.perf_counter() - wall_start
+    return wall, cpu, output.getvalue()
+
+
+@define
+class BenchResult:
+    day: int
+    backend: str
+    wall: list[float]
+    cpu: list[float]
+    answers: list[str]
+    expected: list[str] | None
+
+    @property
+    def correct(self) -> bool | None:
+        if self.expected is None:
+            return None
+        return self.answers == self.expected
+
+    def to_json(self) -> dict[str, Any]:
+        return dict(
+            day=self.day,
+            backend=self.backend,
+            wall=summarise(self.wall),
+            cpu=summarise(self.cpu),
+            samples=dict(wall=self.wall, cpu=self.cpu),
+            answers=self.answers,
+            expected=self.expected,
+            correct=self.correct,
+        )
+
+
+def bench(
+    day: int,
+    data: InputBuffer,
+    *,
+    warmup: int,
+    repeat: int,
+    expected: list[str] | None = None,
+    backend: str | None = None,
+) -> BenchResult:
+    backend = solvers.resolve(day, backend)
+    for _ in range(warmup):
+        run_captured(day, data, backend=backend)
+
+    walls = []
+    cpus = []
+    answers: list[str] = []
+    for _ in range(repeat):
+        wall, cpu, output = run_captured(day, data, backend=backend)
+        walls.append(wall)
+        cpus.append(cpu)
+        answers = parse_answers(output)
+
+    return BenchResult(day, backend, walls, cpus, answers, expected)
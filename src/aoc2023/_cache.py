@@ -0,0 +1,170 @@
+import ast
+import hashlib
+import importlib.util
+import os
+import sys
+from collections.abc import Iterator
+from contextlib import redirect_stdout
+from functools import cache
+from pathlib import Path
+from typing import IO
+
+from ._registry import InputBuffer, solve_input, solvers
+
+RUST_MODULE = "aoc2023._rust"
+
+
+def _relative_imports(source: str, package: str) -> Iterator[str]:
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ImportFrom) and node.level:
+            base = importlib.util.resolve_name(
+                "." * node.level + (node.module or ""), package
+            )
+            if node.module is None:
+                for alias in node.names:
+                    yield f"{base}.{alias.name}"
+            else:
+                yield base
+
+
+def _origin(module_name: str) -> Path | None:
+    if module_name == RUST_MODULE or module_name.startswith(f"{RUST_MODULE}."):
+        # Submodules of the extension are created by the extension itself
+        module_name = RUST_MODULE
+    try:
+        spec = importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.origin is None:
+        return None
+    return Path(spec.origin)
+
+
+@cache
+def module_digest(module_name: str) -> str:
+    """Hash the source of a module and of every module it imports relatively.
+
+    Imports from the Rust extension hash the compiled extension binary instead.
+    """
+    hasher = hashlib.sha256()
+    seen = set()
+    queue = [module_name]
+    while queue:
+        name = queue.pop()
+        origin = _origin(name)
+        if origin is None or origin in seen:
+            continue
+        seen.add(origin)
+        data = origin.read_bytes()
+        hasher.update(str(origin.name).encode())
+        hasher.update(hashlib.sha256(data).digest())
+        if origin.suffix == ".py":
+            package = name if origin.name == "__init__.py" else name.rpartition(".")[0]
+            queue.extend(_relative_imports(data.decode(), package))
+    return hasher.hexdigest()
+
+
+def cache_key(day: int, data: InputBuffer, backend: str | None = None) -> str:
+    """Cache key for day's solver on data.
+
+    Only the solver's module name is needed, so the module isn't imported.
+    Which backend is the default depends on the extension modules, which are
+    part of the module digest.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(f"{day}\0{backend or ''}\0".encode())
+    hasher.update(module_digest(solvers.module_name(day)).encode())
+    hasher.update(hashlib.sha256(data).digest())
+    return hasher.hexdigest()
+
+
+class ResultCache:
+    """Solver output stored on disk, evicting least recently used entries once
+    the total size exceeds max_bytes.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.txt"
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            output = path.read_text()
+        except FileNotFoundError:
+            return None
+        # The modification time is used for LRU eviction
+        os.utime(path)
+        return output
+
+    def put(self, key: str, output: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(output)
+        tmp_path.replace(path)
+        self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.txt"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class Tee:
+    """Write to stream and keep a copy of everything written."""
+
+    def __init__(self, stream: IO[str]) -> None:
+        self._stream = stream
+        self._parts: list[str] = []
+
+    def write(self, s: str) -> int:
+        self._parts.append(s)
+        return self._stream.write(s)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def getvalue(self) -> str:
+        return "".join(self._parts)
+
+
+def run_cached(
+    cache: ResultCache | None,
+    day: int,
+    data: InputBuffer,
+    verbose: int,
+    backend: str | None = None,
+) -> None:
+    """Run day's solver on data, replaying the output from cache when possible.
+
+    Verbose runs always call the solver, since the point is to watch it work.
+    """
+    if cache is None or verbose:
+        solve_input(day, data, verbose, backend)
+        return
+
+    key = cache_key(day, data, backend)
+    output = cache.get(key)
+    if output is not None:
+        sys.stdout.write(output)
+        return
+
+    tee = Tee(sys.stdout)
+    with redirect_stdout(tee):
+        solve_input(day, data, verbose, backend)
+    cache.put(key, tee.getvalue())
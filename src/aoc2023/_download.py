@@ -0,0 +1,168 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+from enum import Enum
+from pathlib import Path
+
+import httpx
+from attrs import define
+
+# Responses worth retrying, anything else is returned or raised immediately
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def input_url(base_url: str, day: int) -> str:
+    return f"{base_url.rstrip('/')}/2023/day/{day}/input"
+
+
+class Status(Enum):
+    DOWNLOADED = "downloaded"
+    NOT_MODIFIED = "not modified"
+    UNAVAILABLE = "not available yet"
+    FAILED = "failed"
+
+
+@define
+class Download:
+    day: int
+    status: Status
+    text: str | None = None
+    error: str | None = None
+
+
+class InputCache:
+    """Downloaded inputs with their validators, so that unchanged inputs can be
+    fetched with a conditional request.
+
+    Entries are keyed by URL and session, so several accounts can share a
+    cache directory.
+    """
+
+    def __init__(self, directory: Path, session: str) -> None:
+        self.directory = directory
+        self.session_digest = hashlib.sha256(session.encode()).hexdigest()
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(f"{self.session_digest}\0{url}".encode()).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def get(self, url: str) -> dict[str, str] | None:
+        try:
+            return json.loads(self._path(url).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def put(self, url: str, response: httpx.Response) -> None:
+        entry = dict(text=response.text)
+        for header in ["etag", "last-modified"]:
+            if header in response.headers:
+                entry[header] = response.headers[header]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry))
+        tmp_path.replace(path)
+
+
+async def get_with_retries(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    headers: dict[str, str],
+    retries: int,
+    backoff: float,
+) -> httpx.Response:
+    """GET url, retrying transport errors and transient statuses with
+    exponential backoff and jitter.
+    """
+    for attempt in range(retries + 1):
+        try:
+            response = await client.get(url, headers=headers)
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+        await asyncio.sleep(backoff * 2**attempt * random.uniform(0.5, 1.5))
+    raise AssertionError("unreachable")
+
+
+async def fetch_input(
+    client: httpx.AsyncClient,
+    day: int,
+    *,
+    base_url: str,
+    cache: InputCache,
+    retries: int,
+    backoff: float,
+) -> Download:
+    url = input_url(base_url, day)
+    headers = {}
+    cached = cache.get(url)
+    if cached is not None:
+        if "etag" in cached:
+            headers["If-None-Match"] = cached["etag"]
+        if "last-modified" in cached:
+            headers["If-Modified-Since"] = cached["last-modified"]
+
+    response = await get_with_retries(
+        client, url, headers=headers, retries=retries, backoff=backoff
+    )
+    if response.status_code == 304 and cached is not None:
+        return Download(day, Status.NOT_MODIFIED, cached["text"])
+    if response.status_code == 404:
+        return Download(day, Status.UNAVAILABLE)
+    response.raise_for_status()
+    cache.put(url, response)
+    return Download(day, Status.DOWNLOADED, response.text)
+
+
+async def fetch_inputs(
+    days: list[int],
+    *,
+    session: str,
+    base_url: str,
+    cache: InputCache,
+    concurrency: int,
+    retries: int = 3,
+    backoff: float = 0.5,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> list[Download]:
+    """Download the input for each day, at most concurrency at a time.
+
+    A day which fails (after retries) is returned with Status.FAILED rather
+    than raising, so that the other days' downloads aren't lost.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(client: httpx.AsyncClient, day: int) -> Download:
+        async with semaphore:
+            return await fetch_input(
+                client,
+                day,
+                base_url=base_url,
+                cache=cache,
+                retries=retries,
+                backoff=backoff,
+            )
+
+    async with httpx.AsyncClient(
+        cookies=dict(session=session), transport=transport
+    ) as client:
+        results = await asyncio.gather(
+            *(fetch(client, day) for day in days), return_exceptions=True
+        )
+
+    downloads = []
+    for day, result in zip(days, results):
+        if isinstance(result, Exception):
+            error = str(result) or type(result).__name__
+            downloads.append(Download(day, Status.FAILED, error=error))
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            downloads.append(result)
+    return downloads
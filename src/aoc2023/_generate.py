@@ -0,0 +1,450 @@
+"""Synthetic puzzle inputs of arbitrary size.
+
+Each generator takes a seeded random number generator and a scale, and returns
+an input which is valid for that day's solver. A scale of 1 gives roughly the
+size of a real puzzle input, and the input grows linearly with the scale (grids
+grow by the square root of the scale in each dimension).
+"""
+
+import math
+import random
+import string
+from collections.abc import Callable, Iterator, Sequence
+
+type Generator = Callable[[random.Random, float], str]
+
+generators: dict[int, Generator] = {}
+
+
+def generator(*, day: int) -> Callable[[Generator], Generator]:
+    def decorator(fn: Generator) -> Generator:
+        if day in generators:
+            raise ValueError(f"Day {day} already has a generator")
+        generators[day] = fn
+        return fn
+
+    return decorator
+
+
+def generate(day: int, *, scale: float, seed: int) -> str:
+    return generators[day](random.Random(seed), scale)
+
+
+def scaled(n: int, scale: float) -> int:
+    return max(1, round(n * scale))
+
+
+def scaled_side(n: int, scale: float) -> int:
+    """Scale one side of a grid, so that its area scales linearly."""
+    return max(1, round(n * math.sqrt(scale)))
+
+
+def lines(it: Iterator[str]) -> str:
+    return "".join(f"{line}\n" for line in it)
+
+
+def grid(
+    rng: random.Random, width: int, height: int, tiles: str, weights: list[float]
+) -> str:
+    return lines("".join(rng.choices(tiles, weights, k=width)) for _ in range(height))
+
+
+@generator(day=1)
+def day01(rng: random.Random, scale: float) -> str:
+    words = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+    def line() -> str:
+        parts = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(2, 8)):
+            match rng.randrange(3):
+                case 0:
+                    parts.append(str(rng.randint(1, 9)))
+                case 1:
+                    parts.append(rng.choice(words))
+                case 2:
+                    parts.append(
+                        "".join(
+                            rng.choices(string.ascii_lowercase, k=rng.randint(1, 6))
+                        )
+                    )
+        rng.shuffle(parts)
+        return "".join(parts)
+
+    return lines(line() for _ in range(scaled(1000, scale)))
+
+
+@generator(day=2)
+def day02(rng: random.Random, scale: float) -> str:
+    colours = ["red", "green", "blue"]
+
+    def game(game_id: int) -> str:
+        sets = []
+        for _ in range(rng.randint(1, 6)):
+            drawn = rng.sample(colours, rng.randint(1, 3))
+            sets.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in drawn))
+        return f"Game {game_id}: {'; '.join(sets)}"
+
+    return lines(game(i) for i in range(1, scaled(100, scale) + 1))
+
+
+@generator(day=3)
+def day03(rng: random.Random, scale: float) -> str:
+    width = scaled_side(140, scale)
+    height = scaled_side(140, scale)
+    symbols = "*#+$/@%=&-"
+    rows = []
+    for _ in range(height):
+        row: list[str] = []
+        while len(row) < width:
+            r = rng.random()
+            if r < 0.15:
+                row.extend(str(rng.randint(1, 999)))
+                row.append(".")
+            elif r < 0.2:
+                row.append(rng.choice(symbols))
+            else:
+                row.append(".")
+        rows.append("".join(row[:width]))
+    return lines(iter(rows))
+
+
+@generator(day=4)
+def day04(rng: random.Random, scale: float) -> str:
+    num_cards = scaled(200, scale)
+
+    def card(card_id: int) -> str:
+        remaining = num_cards - card_id
+        # Keep the expected number of matches below 1 so that the number of
+        # copies doesn't grow exponentially with the number of cards
+        matches = 0 if rng.random() < 0.65 else rng.randint(1, 4)
+        matches = min(matches, remaining)
+        numbers = rng.sample(range(1, 100), 10 + 25 - matches)
+        winning = numbers[:10]
+        mine = winning[:matches] + numbers[10:]
+        rng.shuffle(mine)
+        return (
+            f"Card {card_id:3d}: {' '.join(f'{n:2d}' for n in winning)} | "
+            f"{' '.join(f'{n:2d}' for n in mine)}"
+        )
+
+    return lines(card(i) for i in range(1, num_cards + 1))
+
+
+@generator(day=5)
+def day05(rng: random.Random, scale: float) -> str:
+    limit = 2**32
+    categories = [
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    ]
+    num_seeds = scaled(10, scale)
+    seeds = []
+    for _ in range(num_seeds):
+        start = rng.randrange(limit // 2)
+        seeds.extend([start, rng.randint(1, limit // (4 * num_seeds))])
+
+    sections = ["seeds: " + " ".join(map(str, seeds)) + "\n"]
+    for source, dest in zip(categories, categories[1:]):
+        # Like the real input, the source ranges tile a contiguous span and
+        # are moved to a shuffled order
+        cuts = sorted(rng.sample(range(1, limit), scaled(30, scale) + 1))
+        lengths = [stop - start for start, stop in zip(cuts, cuts[1:])]
+        order = list(range(len(lengths)))
+        rng.shuffle(order)
+        dest_starts = {}
+        dest_start = cuts[0]
+        for i in order:
+            dest_starts[i] = dest_start
+            dest_start += lengths[i]
+        mapping = [
+            f"{dest_starts[i]} {cuts[i]} {length}" for i, length in enumerate(lengths)
+        ]
+        rng.shuffle(mapping)
+        sections.append(f"{source}-to-{dest} map:\n" + "\n".join(mapping) + "\n")
+
+    return "\n".join(sections)
+
+
+@generator(day=6)
+def day06(rng: random.Random, scale: float) -> str:
+    # Part 2 concatenates every number on a line into one, which is solved with
+    # floating point, so the number of races can't grow. Only the values are
+    # random.
+    times = [rng.randint(40, 99) for _ in range(4)]
+    distances = [rng.randint(t, t * t // 4 - 1) for t in times]
+    return (
+        "Time:     " + "".join(f"{t:7d}" for t in times) + "\n"
+        "Distance: " + "".join(f"{d:7d}" for d in distances) + "\n"
+    )
+
+
+@generator(day=7)
+def day07(rng: random.Random, scale: float) -> str:
+    cards = "23456789TJQKA"
+    return lines(
+        f"{''.join(rng.choices(cards, k=5))} {rng.randint(1, 999)}"
+        for _ in range(scaled(1000, scale))
+    )
+
+
+def primes(lo: int, hi: int) -> list[int]:
+    return [
+        n
+        for n in range(max(lo, 2), hi)
+        if all(n % d for d in range(2, math.isqrt(n) + 1))
+    ]
+
+
+@generator(day=8)
+def day08(rng: random.Random, scale: float) -> str:
+    # Like the real input, each start node leads to a loop whose only Z node
+    # is reached after exactly one period, so the LCM of the periods is the
+    # answer to part 2. Each loop is two nodes wide so that the instructions
+    # choose a path.
+    num_ghosts = 6
+    lo = scaled(40, scale)
+    periods = rng.sample(primes(lo, 2 * lo + 20), num_ghosts)
+    num_nodes = sum(2 * p for p in periods) + num_ghosts
+
+    length = 3
+    while 26 ** (length - 1) * 24 < 2 * num_nodes:
+        length += 1
+
+    middle = string.ascii_uppercase
+    last = string.ascii_uppercase[1:-1]  # not A or Z
+    used = {"AAA", "ZZZ"}
+
+    def name(suffix: str | None = None) -> str:
+        while True:
+            end = suffix or rng.choice(last)
+            candidate = "".join(rng.choices(middle, k=length - 1)) + end
+            if candidate not in used:
+                used.add(candidate)
+                return candidate
+
+    nodes: dict[str, tuple[str, str]] = {}
+    for ghost, period in enumerate(periods):
+        left = [name() for _ in range(period - 1)] + [
+            "ZZZ" if ghost == 0 else name("Z")
+        ]
+        right = [name() for _ in range(period - 1)] + [name("Z")]
+        for i in range(period):
+            step = (left[(i + 1) % period], right[(i + 1) % period])
+            nodes[left[i]] = step
+            nodes[right[i]] = step
+        start = "AAA" if ghost == 0 else name("A")
+        nodes[start] = (left[0], right[0])
+
+    instructions = "".join(rng.choices("LR", k=scaled(280, scale)))
+    items = list(nodes.items())
+    rng.shuffle(items)
+    return instructions + "\n\n" + lines(f"{n} = ({l}, {r})" for n, (l, r) in items)
+
+
+@generator(day=9)
+def day09(rng: random.Random, scale: float) -> str:
+    def history() -> str:
+        degree = rng.randint(1, 8)
+        coefficients = [rng.randint(-5, 5) for _ in range(degree + 1)]
+        x0 = rng.randint(-5, 5)
+        values = (
+            sum(c * (x0 + x) ** i for i, c in enumerate(coefficients))
+            for x in range(21)
+        )
+        return " ".join(map(str, values))
+
+    return lines(history() for _ in range(scaled(200, scale)))
+
+
+@generator(day=10)
+def day10(rng: random.Random, scale: float) -> str:
+    # The loop is the outline of a random spanning tree of a coarse grid,
+    # drawn with cells at even coordinates and tree edges at the odd
+    # coordinates between them. The outline of a tree has no holes or pinch
+    # points, so it is a single simple loop through the cell corners.
+    side = scaled_side(35, scale)
+    cells = {(0, 0)}
+    frontier = [((0, 0), (1, 0)), ((0, 0), (0, 1))]
+    filled = {(0, 0)}
+    while frontier:
+        a, b = frontier.pop(rng.randrange(len(frontier)))
+        if b in cells or not (0 <= b[0] < side and 0 <= b[1] < side):
+            continue
+        cells.add(b)
+        filled.add((2 * b[0], 2 * b[1]))
+        filled.add((a[0] + b[0], a[1] + b[1]))
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            frontier.append((b, (b[0] + dx, b[1] + dy)))
+
+    # Corner (x, y) is the top left of filled cell (x, y). Corners are drawn
+    # two tiles apart so that the loop encloses tiles, offset by one so the
+    # loop doesn't touch the edge of the grid.
+    links: dict[tuple[int, int], set[str]] = {}
+    directions = {"E": (1, 0), "S": (0, 1)}
+    opposite = {"E": "W", "S": "N"}
+
+    def link(corner: tuple[int, int], direction: str) -> None:
+        dx, dy = directions[direction]
+        x, y = 2 * corner[0] + 1, 2 * corner[1] + 1
+        links.setdefault((x, y), set()).add(direction)
+        links.setdefault((x + dx, y + dy), set()).update(
+            [direction, opposite[direction]]
+        )
+        links.setdefault((x + 2 * dx, y + 2 * dy), set()).add(opposite[direction])
+
+    for x, y in filled:
+        if (x, y - 1) not in filled:
+            link((x, y), "E")
+        if (x, y + 1) not in filled:
+            link((x, y + 1), "E")
+        if (x - 1, y) not in filled:
+            link((x, y), "S")
+        if (x + 1, y) not in filled:
+            link((x + 1, y), "S")
+
+    pipes = {
+        frozenset("NS"): "|",
+        frozenset("EW"): "-",
+        frozenset("NE"): "L",
+        frozenset("NW"): "J",
+        frozenset("SW"): "7",
+        frozenset("SE"): "F",
+    }
+    size = 4 * side + 1
+    rows = [rng.choices("|-LJ7F.", [1, 1, 1, 1, 1, 1, 3], k=size) for _ in range(size)]
+    for (x, y), linked in links.items():
+        rows[y][x] = pipes[frozenset(linked)]
+
+    sx, sy = rng.choice(sorted(links))
+    rows[sy][sx] = "S"
+    # Tiles next to S which aren't part of the loop mustn't point at it
+    for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+        if (sx + dx, sy + dy) not in links:
+            rows[sy + dy][sx + dx] = "."
+    return lines("".join(row) for row in rows)
+
+
+@generator(day=11)
+def day11(rng: random.Random, scale: float) -> str:
+    width = scaled_side(140, scale)
+    height = scaled_side(140, scale)
+    empty_rows = set(rng.sample(range(height), height // 20))
+    empty_cols = set(rng.sample(range(width), width // 20))
+    return lines(
+        "".join(
+            "#"
+            if x not in empty_cols and y not in empty_rows and rng.random() < 0.023
+            else "."
+            for x in range(width)
+        )
+        for y in range(height)
+    )
+
+
+@generator(day=12)
+def day12(rng: random.Random, scale: float) -> str:
+    def record() -> str:
+        springs = "".join(rng.choices(".#", k=rng.randint(4, 20)))
+        groups = [len(group) for group in springs.split(".") if group]
+        if not groups:
+            springs = "#" + springs[1:]
+            groups = [len(group) for group in springs.split(".") if group]
+        masked = "".join("?" if rng.random() < 0.5 else c for c in springs)
+        return f"{masked} {','.join(map(str, groups))}"
+
+    return lines(record() for _ in range(scaled(1000, scale)))
+
+
+@generator(day=13)
+def day13(rng: random.Random, scale: float) -> str:
+    def pattern() -> str:
+        width = rng.randint(5, 17)
+        height = rng.randint(5, 17)
+        rows = [rng.choices("#.", k=width) for _ in range(height)]
+        if rng.random() < 0.5:
+            axis = rng.randint(1, width - 1)
+            for row in rows:
+                for i in range(min(axis, width - axis)):
+                    row[axis + i] = row[axis - 1 - i]
+        else:
+            axis = rng.randint(1, height - 1)
+            for i in range(min(axis, height - axis)):
+                rows[axis + i] = rows[axis - 1 - i].copy()
+        return lines("".join(row) for row in rows)
+
+    return "\n".join(pattern() for _ in range(scaled(100, scale)))
+
+
+@generator(day=14)
+def day14(rng: random.Random, scale: float) -> str:
+    side = scaled_side(100, scale)
+    return grid(rng, side, side, "O#.", [0.2, 0.15, 0.65])
+
+
+@generator(day=15)
+def day15(rng: random.Random, scale: float) -> str:
+    labels = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(scaled(500, scale))
+    ]
+
+    def step() -> str:
+        label = rng.choice(labels)
+        if rng.random() < 0.4:
+            return f"{label}-"
+        return f"{label}={rng.randint(1, 9)}"
+
+    return ",".join(step() for _ in range(scaled(4000, scale))) + "\n"
+
+
+@generator(day=16)
+def day16(rng: random.Random, scale: float) -> str:
+    side = scaled_side(110, scale)
+    return grid(rng, side, side, r"./\|-", [0.9, 0.025, 0.025, 0.025, 0.025])
+
+
+def fit_exponent(sizes: Sequence[float], times: Sequence[float]) -> float:
+    """Least squares fit of log(time) = b log(size) + c, returning b."""
+    xs = [math.log(s) for s in sizes]
+    ys = [math.log(t) for t in times]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return math.nan
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+
+
+MODELS: dict[str, Callable[[float], float]] = {
+    "O(1)": lambda n: 1,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: n,
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: n**2,
+    "O(n^3)": lambda n: n**3,
+}
+
+
+def best_model(sizes: Sequence[float], times: Sequence[float]) -> str:
+    """The complexity class which best fits time = a f(size).
+
+    Fits a by least squares on relative error for each model.
+    """
+    best = None
+    for name, f in MODELS.items():
+        fs = [f(n) for n in sizes]
+        # minimise sum(((a f - t) / t)^2)
+        a = sum(fi / t for fi, t in zip(fs, times)) / sum(
+            (fi / t) ** 2 for fi, t in zip(fs, times)
+        )
+        error = sum(((a * fi - t) / t) ** 2 for fi, t in zip(fs, times))
+        if best is None or error < best[0]:
+            best = error, name
+    assert best is not None
+    return best[1]
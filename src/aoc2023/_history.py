@@ -0,0 +1,239 @@
+import datetime as dt
+import math
+import platform
+import sqlite3
+import statistics
+import subprocess
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+
+from attrs import define
+
+from ._bench import BenchResult
+
+SCHEMA = """\
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    git_commit TEXT NOT NULL,
+    python TEXT NOT NULL,
+    rust INTEGER NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    day INTEGER NOT NULL,
+    wall REAL NOT NULL,
+    cpu REAL NOT NULL,
+    backend TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS day_runtimes (
+    day INTEGER PRIMARY KEY,
+    elapsed REAL NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_key ON runs (git_commit, python);
+CREATE INDEX IF NOT EXISTS samples_run ON samples (run_id, day);
+"""
+
+
+def python_version() -> str:
+    return f"{platform.python_implementation()} {platform.python_version()}"
+
+
+def resolve_commit(rev: str = "HEAD") -> str:
+    """Resolve a git revision to a full commit hash.
+
+    If git is unavailable (or rev isn't a revision), rev is returned as is so
+    that previously recorded hashes can still be looked up.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", f"{rev}^{{commit}}"],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return rev
+    if result.returncode != 0:
+        return rev
+    return result.stdout.strip()
+
+
+def working_tree_dirty() -> bool:
+    try:
+        result = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+        )
+    except OSError:
+        return False
+    return bool(result.stdout.strip())
+
+
+class History:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "History":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def record(
+        self,
+        results: Iterable[BenchResult],
+        *,
+        commit: str,
+        python: str,
+        rust: bool,
+    ) -> int:
+        with self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (git_commit, python, rust, created) "
+                "VALUES (?, ?, ?, ?)",
+                (commit, python, rust, dt.datetime.now(dt.UTC).isoformat()),
+            )
+            run_id = cursor.lastrowid
+            assert run_id is not None
+            self._conn.executemany(
+                "INSERT INTO samples (run_id, day, wall, cpu, backend) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (run_id, result.day, wall, cpu, result.backend)
+                    for result in results
+                    for wall, cpu in zip(result.wall, result.cpu, strict=True)
+                ],
+            )
+        return run_id
+
+    def samples(
+        self, *, commit: str, python: str, backend: str | None = None
+    ) -> dict[tuple[int, str], list[float]]:
+        """Return wall time samples per day and backend, pooled over all
+        matching runs. If backend is given, only its samples are returned.
+        """
+        query = (
+            "SELECT day, backend, wall FROM samples "
+            "JOIN runs ON runs.id = samples.run_id "
+            "WHERE git_commit = ? AND python = ?"
+        )
+        params: tuple[str, ...] = (commit, python)
+        if backend is not None:
+            query += " AND backend = ?"
+            params += (backend,)
+        samples: defaultdict[tuple[int, str], list[float]] = defaultdict(list)
+        for day, day_backend, wall in self._conn.execute(query, params):
+            samples[day, day_backend].append(wall)
+        return dict(samples)
+
+    def record_runtimes(self, runtimes: Mapping[int, float]) -> None:
+        """Store the latest run-all time of each day, for scheduling."""
+        created = dt.datetime.now(dt.UTC).isoformat()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO day_runtimes (day, elapsed, created) VALUES (?, ?, ?) "
+                "ON CONFLICT (day) DO UPDATE "
+                "SET elapsed = excluded.elapsed, created = excluded.created",
+                [(day, elapsed, created) for day, elapsed in runtimes.items()],
+            )
+
+    def runtimes(self) -> dict[int, float]:
+        """The latest run-all time of each day."""
+        return dict(self._conn.execute("SELECT day, elapsed FROM day_runtimes"))
+
+    def latest_medians(self) -> dict[int, float]:
+        """Median wall time per day from the most recent run that includes it."""
+        cursor = self._conn.execute(
+            "SELECT day, wall FROM samples WHERE run_id = ("
+            "  SELECT max(run_id) FROM samples AS s WHERE s.day = samples.day"
+            ")"
+        )
+        samples: defaultdict[int, list[float]] = defaultdict(list)
+        for day, wall in cursor:
+            samples[day].append(wall)
+        return {day: statistics.median(walls) for day, walls in samples.items()}
+
+
+def mann_whitney_greater(base: Sequence[float], head: Sequence[float]) -> float:
+    """One-sided Mann-Whitney U test that head tends to be larger than base.
+
+    Returns the p-value using the normal approximation with tie correction.
+    """
+    n1 = len(base)
+    n2 = len(head)
+    combined = sorted([(x, 0) for x in base] + [(x, 1) for x in head])
+
+    # Assign average ranks to ties
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        for k in range(i, j + 1):
+            ranks[k] = rank
+        t = j - i + 1
+        tie_term += t**3 - t
+        i = j + 1
+
+    rank_sum_head = sum(r for r, (_, group) in zip(ranks, combined) if group == 1)
+    u = rank_sum_head - n2 * (n2 + 1) / 2
+    mean = n1 * n2 / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # continuity correction
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@define
+class Comparison:
+    day: int
+    backend: str
+    base_median: float
+    head_median: float
+    p_value: float
+    regression: bool
+
+    @property
+    def change(self) -> float:
+        return self.head_median / self.base_median - 1
+
+
+def compare(
+    base: dict[tuple[int, str], list[float]],
+    head: dict[tuple[int, str], list[float]],
+    *,
+    threshold: float,
+    alpha: float,
+) -> list[Comparison]:
+    """Compare wall time samples for the days and backends present in both
+    base and head.
+
+    A day is a regression if its median slowed down by more than threshold
+    (a fraction) and the slowdown is significant at the alpha level.
+    """
+    comparisons = []
+    for key in sorted(base.keys() & head.keys()):
+        day, backend = key
+        base_median = statistics.median(base[key])
+        head_median = statistics.median(head[key])
+        p_value = mann_whitney_greater(base[key], head[key])
+        regression = head_median > base_median * (1 + threshold) and p_value < alpha
+        comparisons.append(
+            Comparison(day, backend, base_median, head_median, p_value, regression)
+        )
+    return comparisons
@@ -0,0 +1,174 @@
+import gc
+import signal
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import IO
+
+from attrs import define, field
+
+# Number of frames stored per allocation, 1 means sites are single lines
+TRACEBACK_LIMIT = 1
+
+
+def format_bytes(size: float) -> str:
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(size) < 1024:
+            break
+        size /= 1024
+    else:
+        unit = "GiB"
+    return f"{size:.1f}{unit}"
+
+
+@contextmanager
+def tracing_allocations() -> Iterator[None]:
+    gc.collect()
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start(TRACEBACK_LIMIT)
+    try:
+        yield
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def _filter(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+    return snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, f"<attrs generated methods {__name__}.*"),
+        ]
+    )
+
+
+@define
+class PeakTracker:
+    """Take a snapshot whenever traced memory reaches a new high.
+
+    Checked every interval seconds of CPU time, so the snapshot is only
+    approximately at the peak.
+    """
+
+    interval: float
+    snapshot: tracemalloc.Snapshot | None = None
+    snapshot_size: int = 0
+    _previous: object = field(default=None, init=False)
+
+    def _handler(self, signum: int, frame: object) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        # Snapshots are expensive, so wait for a meaningful new high
+        if current > self.snapshot_size * 1.1:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def __enter__(self) -> "PeakTracker":
+        self._previous = signal.signal(signal.SIGVTALRM, self._handler)
+        signal.setitimer(signal.ITIMER_VIRTUAL, self.interval, self.interval)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+        signal.signal(signal.SIGVTALRM, self._previous)  # type: ignore[arg-type]
+
+
+def print_top(
+    stats: list[tracemalloc.Statistic] | list[tracemalloc.StatisticDiff],
+    top: int,
+    stream: IO[str],
+) -> None:
+    for stat in stats[:top]:
+        frame = stat.traceback[0]
+        if isinstance(stat, tracemalloc.StatisticDiff):
+            size = f"{format_bytes(stat.size_diff):>10} {stat.count_diff:+8d}"
+        else:
+            size = f"{format_bytes(stat.size):>10} {stat.count:8d}"
+        print(f"{size}  {frame.filename}:{frame.lineno}", file=stream)
+
+
+def report_memory(
+    fn: Callable[..., None],
+    *args: object,
+    top: int,
+    stream: IO[str],
+    interval: float = 0.01,
+) -> None:
+    """Run fn and report its peak memory and top allocation sites."""
+    with tracing_allocations():
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.take_snapshot()
+        start, _ = tracemalloc.get_traced_memory()
+        with PeakTracker(interval) as tracker:
+            fn(*args)
+        current, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        retained = tracemalloc.take_snapshot()
+
+    print(f"Peak memory:     {format_bytes(peak - start)}", file=stream)
+    print(f"Retained memory: {format_bytes(current - start)}", file=stream)
+
+    if tracker.snapshot is not None:
+        print(
+            f"\nTop allocation sites near peak "
+            f"({format_bytes(tracker.snapshot_size - start)}):",
+            file=stream,
+        )
+        stats = _filter(tracker.snapshot).compare_to(_filter(baseline), "lineno")
+        print_top(stats, top, stream)
+
+    print("\nTop allocation sites retained after solving:", file=stream)
+    print_top(_filter(retained).compare_to(_filter(baseline), "lineno"), top, stream)
+
+
+@define
+class SoakResult:
+    # Traced memory after each iteration, in bytes
+    retained: list[int]
+    peaks: list[int]
+    growth: list[tracemalloc.StatisticDiff]
+
+    @property
+    def growth_per_iteration(self) -> float:
+        """Average growth after the first iteration, which is warmup."""
+        if len(self.retained) < 2:
+            return 0
+        return (self.retained[-1] - self.retained[0]) / (len(self.retained) - 1)
+
+
+def soak(
+    fn: Callable[[], object],
+    *,
+    iterations: int,
+    progress: Callable[[int, int, int], None] | None = None,
+) -> SoakResult:
+    """Call fn repeatedly, measuring memory retained between calls.
+
+    The first iteration is treated as warmup: caches and imports which are
+    only filled once aren't leaks.
+    """
+    retained = []
+    peaks = []
+    first_snapshot = None
+    with tracing_allocations():
+        for i in range(iterations):
+            tracemalloc.reset_peak()
+            fn()
+            gc.collect()
+            current, peak = tracemalloc.get_traced_memory()
+            retained.append(current)
+            peaks.append(peak)
+            if i == 0:
+                first_snapshot = tracemalloc.take_snapshot()
+            if progress is not None:
+                progress(i, current, peak)
+        last_snapshot = tracemalloc.take_snapshot()
+
+    assert first_snapshot is not None
+    growth = [
+        stat
+        for stat in _filter(last_snapshot).compare_to(_filter(first_snapshot), "lineno")
+        if stat.size_diff > 0
+    ]
+    return SoakResult(retained, peaks, growth)
@@ -0,0 +1,106 @@
+"""Microbenchmarks of the hot loops in _util, comparing against the
+implementations they replaced.
+"""
+
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from attrs import define
+
+from ._generate import generate
+from ._util import NEIGHBOUR_OFFSETS, Vector
+
+
+@define(frozen=True)
+class AttrsVector[T: (float, int)]:
+    """Vector as it was before it became a tuple."""
+
+    x: T
+    y: T
+
+    def __add__(self, other: "AttrsVector[T]") -> "AttrsVector[T]":
+        if isinstance(other, AttrsVector):
+            return AttrsVector(self.x + other.x, self.y + other.y)
+
+        return NotImplemented
+
+
+type Setup = Callable[[type[Any]], Callable[[], object]]
+
+microbenchmarks: dict[str, Setup] = {}
+
+
+def microbenchmark(name: str) -> Callable[[Setup], Setup]:
+    def decorator(fn: Setup) -> Setup:
+        microbenchmarks[name] = fn
+        return fn
+
+    return decorator
+
+
+def cells(day: int) -> tuple[list[str], int, int]:
+    rows = generate(day, scale=1, seed=0).splitlines()
+    return rows, len(rows[0]), len(rows)
+
+
+@microbenchmark("day03-neighbours")
+def digit_neighbours(vector: type[Any]) -> Callable[[], object]:
+    """Look up the in-bounds neighbours of every digit, like day 3."""
+    rows, width, height = cells(3)
+    digits = [vector(x, y) for y, row in enumerate(rows) for x, c in enumerate(row)]
+    digits = [pos for pos in digits if rows[pos.y][pos.x].isdigit()]
+    offsets = [vector(dx, dy) for dx, dy in NEIGHBOUR_OFFSETS]
+
+    def run() -> object:
+        found = set()
+        for pos in digits:
+            for offset in offsets:
+                loc = pos + offset
+                if 0 <= loc.x < width and 0 <= loc.y < height:
+                    found.add(loc)
+        return found
+
+    return run
+
+
+@microbenchmark("day10-graph")
+def pipe_graph(vector: type[Any]) -> Callable[[], object]:
+    """Build the graph of connected pipes, like day 10."""
+    rows, width, height = cells(10)
+    north, east, south, west = (
+        vector(0, -1),
+        vector(1, 0),
+        vector(0, 1),
+        vector(-1, 0),
+    )
+    directions = {
+        "|": [north, south],
+        "-": [east, west],
+        "L": [north, east],
+        "J": [north, west],
+        "7": [south, west],
+        "F": [south, east],
+        ".": [],
+        "S": [],
+    }
+
+    def run() -> object:
+        graph = {}
+        for y, row in enumerate(rows):
+            for x, tile in enumerate(row):
+                pos = vector(x, y)
+                graph[pos] = {pos + direction for direction in directions[tile]}
+        return graph
+
+    return run
+
+
+def run(name: str, *, repeat: int) -> dict[str, float]:
+    """Return the best time of each implementation for microbenchmark name."""
+    setup = microbenchmarks[name]
+    times = {}
+    for label, vector in [("attrs", AttrsVector), ("tuple", Vector)]:
+        fn = setup(vector)
+        times[label] = min(timeit.repeat(fn, number=1, repeat=repeat))
+    return times
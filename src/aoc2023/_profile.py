@@ -0,0 +1,103 @@
+import cProfile
+import os
+import pstats
+import signal
+import sys
+from collections import Counter
+from collections.abc import Callable
+from pathlib import Path
+from types import FrameType
+from typing import IO
+
+
+def profile_deterministic(
+    fn: Callable[..., None],
+    *args: object,
+    top: int,
+    stream: IO[str],
+    prof_file: Path | None = None,
+) -> None:
+    """Profile fn with cProfile, printing the top functions by own time."""
+    profiler = cProfile.Profile()
+    profiler.runcall(fn, *args)
+    if prof_file is not None:
+        profiler.dump_stats(prof_file)
+    stats = pstats.Stats(profiler, stream=stream)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(top)
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = os.path.basename(code.co_filename)
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """Statistical profiler sampling the Python stack on SIGPROF.
+
+    Only frames below run are recorded.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._base: FrameType | None = None
+
+    def _handler(self, signum: int, frame: FrameType | None) -> None:
+        stack = []
+        while frame is not None and frame is not self._base:
+            stack.append(frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def run(self, fn: Callable[..., None], *args: object) -> None:
+        self._base = sys._getframe()
+        previous = signal.signal(signal.SIGPROF, self._handler)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        try:
+            fn(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous)
+            self._base = None
+
+    def write_collapsed(self, file: IO[str]) -> None:
+        """Write stacks in the collapsed format used by flamegraph tools."""
+        for stack, count in sorted(self.stacks.items()):
+            file.write(f"{';'.join(stack)} {count}\n")
+
+    def print_top(self, top: int, stream: IO[str]) -> None:
+        total = self.stacks.total()
+        own: Counter[str] = Counter()
+        cumulative: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                cumulative[label] += count
+
+        print(f"{total} samples", file=stream)
+        print(f"{'own':>7} {'cumul':>7}  function", file=stream)
+        for label, count in own.most_common(top):
+            print(
+                f"{count / total:7.1%} {cumulative[label] / total:7.1%}  {label}",
+                file=stream,
+            )
+
+
+def profile_sampling(
+    fn: Callable[..., None],
+    *args: object,
+    top: int,
+    stream: IO[str],
+    interval: float = 0.001,
+    collapsed_file: IO[str] | None = None,
+) -> None:
+    sampler = Sampler(interval)
+    sampler.run(fn, *args)
+    if not sampler.stacks:
+        print("No samples collected", file=stream)
+        return
+    sampler.print_top(top, stream)
+    if collapsed_file is not None:
+        sampler.write_collapsed(collapsed_file)
@@ -1,5 +1,16 @@
-from collections.abc import Callable
-from typing import IO, Protocol
+import importlib
+import io
+import mmap
+import os
+import stat
+import sys
+import weakref
+from collections.abc import Callable, Iterator, Mapping
+from typing import IO, Protocol, Self
+
+# Input passed to buffer solvers: the memory-mapped input file, or bytes if it
+# can't be mapped (e.g. stdin). Both support len, indexing, slicing and find.
+type InputBuffer = bytes | mmap.mmap
 
 
 class Solver(Protocol):
@@ -7,14 +18,174 @@ class Solver(Protocol):
         ...
 
 
-solvers: dict[int, Solver] = dict()
+class BufferSolver(Protocol):
+    def __call__(self, data: InputBuffer, verbose: int) -> None:
+        ...
+
+
+type AnySolver = Solver | BufferSolver
+
+# Implementations a day can register, fastest first. A day's default backend
+# is the first one it has registered.
+BACKENDS = ("rust", "numpy", "python")
+
+
+class Solvers(Mapping[int, AnySolver]):
+    """Registered solvers, importing a day's module when it is looked up.
+
+    Modules are declared in the manifest (see aoc2023/__init__.py) and register
+    their solvers using the register decorator when imported. Looking up a day
+    returns its default backend.
+    """
+
+    def __init__(self) -> None:
+        self.modules: dict[int, str] = {}
+        self._registered: dict[int, dict[str, AnySolver]] = {}
+        self._buffer: set[tuple[int, str]] = set()
+
+    def module_name(self, day: int) -> str:
+        """Return the module name for day without importing it."""
+        if day in self._registered:
+            return next(iter(self._registered[day].values())).__module__
+        return f"{__package__}.{self.modules[day]}"
+
+    def _load(self, day: int) -> dict[str, AnySolver]:
+        if day not in self._registered and day in self.modules:
+            importlib.import_module(self.module_name(day))
+        return self._registered[day]
+
+    def __getitem__(self, day: int) -> AnySolver:
+        return self.solver(day)
+
+    def backends(self, day: int) -> list[str]:
+        """Backends registered for day, default first."""
+        registered = self._load(day)
+        return [backend for backend in BACKENDS if backend in registered]
+
+    def resolve(self, day: int, backend: str | None = None) -> str:
+        """Return backend if day has it, otherwise day's default backend."""
+        backends = self.backends(day)
+        if backend in backends:
+            return backend
+        return backends[0]
+
+    def solver(self, day: int, backend: str | None = None) -> AnySolver:
+        backend = self.resolve(day, backend)
+        return self._registered[day][backend]
+
+    def __contains__(self, day: object) -> bool:
+        return day in self._registered or day in self.modules
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted(self.modules.keys() | self._registered.keys()))
+
+    def __len__(self) -> int:
+        return len(self.modules.keys() | self._registered.keys())
+
+    def takes_buffer(self, day: int, backend: str | None = None) -> bool:
+        """Whether day's solver is a BufferSolver"""
+        return (day, self.resolve(day, backend)) in self._buffer
+
+    def register(
+        self,
+        day: int,
+        fn: AnySolver,
+        *,
+        buffer: bool = False,
+        backend: str = "python",
+    ) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}")
+        registered = self._registered.setdefault(day, {})
+        if backend in registered:
+            raise ValueError(f"Day {day} is already registered for {backend}")
+        registered[backend] = fn
+        if buffer:
+            self._buffer.add((day, backend))
 
 
-def register(*, day: int) -> Callable[[Solver], Solver]:
-    def decorator(fn: Solver) -> Solver:
-        if day in solvers:
-            raise ValueError(f"Day {day} is already registered")
-        solvers[day] = fn
+solvers = Solvers()
+
+
+def register[
+    F: AnySolver
+](*, day: int, buffer: bool = False, backend: str = "python",) -> Callable[[F], F]:
+    """Register a solver for day.
+
+    Solvers receive the input as a text file, or as an InputBuffer if buffer
+    is true. Fast paths are registered under another backend alongside the
+    readable python one, and must print the same answers.
+    """
+
+    def decorator(fn: F) -> F:
+        solvers.register(day, fn, buffer=buffer, backend=backend)
         return fn
 
     return decorator
+
+
+class MappedInput(mmap.mmap):
+    """A memory-mapped input file, holding its own descriptor for the file so
+    that text solvers can read it as a file too.
+    """
+
+    fd: int
+
+    @classmethod
+    def open(cls, fileno: int) -> Self:
+        mapping = cls(fileno, 0, access=mmap.ACCESS_READ)
+        mapping.fd = os.dup(fileno)
+        weakref.finalize(mapping, os.close, mapping.fd)
+        return mapping
+
+
+def text_file(data: InputBuffer) -> IO[str]:
+    """Open input as a text file, like open(path) would.
+
+    Mapped inputs are reopened from their descriptor rather than copied.
+    BytesIO shares bytes until it is written to, so bytes aren't copied either.
+    """
+    if isinstance(data, MappedInput):
+        file = open(data.fd, closefd=False)
+        file.seek(0)
+        return file
+    return io.TextIOWrapper(io.BytesIO(data))
+
+
+def read_input(file: IO[bytes]) -> InputBuffer:
+    """Memory-map file if it is a regular file, otherwise read it."""
+    try:
+        fileno = file.fileno()
+        st = os.fstat(fileno)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        return file.read()
+
+    # Empty files can't be mapped
+    if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+        return file.read()
+
+    return MappedInput.open(fileno)
+
+
+def solve_input(
+    day: int, data: InputBuffer, verbose: int, backend: str | None = None
+) -> None:
+    """Call day's solver with data, using the protocol it was registered with.
+
+    The default backend is used if backend is None or day doesn't have it.
+    Verbose runs report the solver's memoized functions to stderr.
+    """
+    solve = solvers.solver(day, backend)
+    if verbose:
+        # Only imported when needed, so that it isn't timed or profiled as
+        # part of the solver
+        from ._util import reset_memo_stats, write_memo_stats
+
+        reset_memo_stats()
+    if solvers.takes_buffer(day, backend):
+        solve(data, verbose)  # type: ignore[arg-type]
+    else:
+        with text_file(data) as file:
+            solve(file, verbose)  # type: ignore[arg-type]
+    if verbose:
+        write_memo_stats(sys.stderr)
@@ -0,0 +1,149 @@
+import glob
+import io
+import signal
+import time
+import traceback
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+
+from attrs import define
+
+from ._registry import InputBuffer, read_input, solve_input, solvers
+
+
+@define
+class DayOutput:
+    day: int
+    output: str
+    elapsed: float
+    error: str | None = None
+
+
+class SolverTimeout(Exception):
+    pass
+
+
+def init_worker(memory_limit: int | None) -> None:
+    """Process pool initializer, memory_limit is in bytes."""
+    if memory_limit is not None:
+        import resource
+
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            memory_limit = min(memory_limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+
+
+@contextmanager
+def time_limit(seconds: float | None) -> Iterator[None]:
+    if seconds is None:
+        yield
+        return
+
+    def handler(signum: int, frame: object) -> None:
+        raise SolverTimeout(f"Timed out after {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_day(day: int, path: Path, verbose: int, timeout: float | None) -> DayOutput:
+    """Run solver for day in a worker process, capturing what it prints."""
+    with open(path, "rb") as file:
+        return run_input(day, read_input(file), verbose, timeout)
+
+
+def run_input(
+    day: int, data: InputBuffer, verbose: int, timeout: float | None
+) -> DayOutput:
+    output = io.StringIO()
+    error = None
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(output), time_limit(timeout):
+            solve_input(day, data, verbose)
+    except SolverTimeout as exc:
+        error = str(exc)
+    except MemoryError:
+        error = "Exceeded memory limit"
+    except Exception:
+        error = traceback.format_exc()
+    elapsed = time.perf_counter() - start
+    return DayOutput(day, output.getvalue(), elapsed, error)
+
+
+# Extra time the parent gives a day past its timeout before giving up on it
+GRACE_PERIOD = 5.0
+
+
+def wait_for_day(day: int, future: Future[DayOutput], timeout: float) -> DayOutput:
+    """Wait for a day run in a worker process.
+
+    The worker's own time limit is a signal, which can't interrupt native code
+    such as the Rust extension, so the day is also given up on here once it
+    has been running for longer. If the worker died, e.g. past its memory
+    limit, the day is reported as failed too.
+    """
+    started = None
+    while True:
+        try:
+            return future.result(timeout=0.1)
+        except TimeoutError:
+            now = time.perf_counter()
+            if started is None:
+                if future.running():
+                    started = now
+            # A running call may be queued behind another day for up to that
+            # day's timeout
+            elif now - started > 2 * timeout + GRACE_PERIOD:
+                return DayOutput(
+                    day, "", now - started, f"Timed out after {timeout}s (hung)"
+                )
+        except BrokenProcessPool:
+            return DayOutput(day, "", 0.0, "Worker process died")
+
+
+def kill_workers(executor: ProcessPoolExecutor) -> None:
+    """Kill the executor's worker processes, e.g. ones stuck in a hung day.
+
+    ProcessPoolExecutor has no public way to do this before Python 3.14.
+    """
+    for process in list(executor._processes.values()):
+        process.kill()
+
+
+def schedule(days: list[int], medians: dict[int, float]) -> list[int]:
+    """Order days longest-first by previously observed median runtime.
+
+    Days that have never been timed are assumed to be slow and go first.
+    """
+    return sorted(days, key=lambda day: medians.get(day, float("inf")), reverse=True)
+
+
+def init_batch_worker(day: int, memory_limit: int | None) -> None:
+    """Process pool initializer for running one day, importing its solver
+    up front so that the first input isn't slower.
+    """
+    init_worker(memory_limit)
+    solvers[day]
+
+
+def expand_paths(patterns: Iterable[str]) -> list[Path]:
+    """Expand glob patterns, keeping the first occurrence of each path."""
+    paths: dict[Path, None] = {}
+    for pattern in patterns:
+        if any(c in pattern for c in "*?["):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        for match in matches:
+            paths.setdefault(Path(match))
+    return list(paths)
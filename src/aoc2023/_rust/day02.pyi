@@ -1,3 +1,4 @@
+from collections.abc import Buffer
 from typing import ClassVar
 
 class Colour:
@@ -10,3 +11,4 @@ class Game:
     sets: list[list[tuple[int, Colour]]]
 
 def parse_game(input: str) -> Game: ...
+def parse_games(data: Buffer) -> bytes: ...
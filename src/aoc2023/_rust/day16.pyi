@@ -0,0 +1,18 @@
+from collections.abc import Buffer
+from typing import ClassVar
+
+from .._util import Vector
+
+class Contraption:
+    width: int
+    height: int
+    def __init__(self, data: Buffer) -> None: ...
+
+class Direction:
+    RIGHT: ClassVar[Direction]
+    DOWN: ClassVar[Direction]
+    LEFT: ClassVar[Direction]
+    UP: ClassVar[Direction]
+
+def fire_laser(grid: Contraption, pos: Vector[int], direction: Direction) -> int: ...
+def max_edge_energized(grid: Contraption) -> int: ...
@@ -0,0 +1,183 @@
+"""Warm solver daemon, serving requests over a Unix domain socket.
+
+Each request is a header with the day and input length, followed by the input
+bytes. Each response is a length-prefixed JSON object with the fields of
+DayOutput. A connection may send any number of requests.
+"""
+
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import socketserver
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from threading import BrokenBarrierError
+
+from attrs import asdict
+
+from ._registry import solvers
+from ._runall import DayOutput, init_worker, run_input
+
+REQUEST_HEADER = struct.Struct("!BQ")
+RESPONSE_HEADER = struct.Struct("!Q")
+
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if n == 0:
+            raise EOFError("Connection closed")
+        received += n
+    return bytes(buffer)
+
+
+def send_request(sock: socket.socket, day: int, data: bytes) -> None:
+    sock.sendall(REQUEST_HEADER.pack(day, len(data)))
+    sock.sendall(data)
+
+
+def recv_request(sock: socket.socket) -> tuple[int, bytes] | None:
+    """Return the next (day, input) sent on sock, or None at end of stream."""
+    try:
+        header = recv_exactly(sock, REQUEST_HEADER.size)
+    except EOFError:
+        return None
+    day, size = REQUEST_HEADER.unpack(header)
+    return day, recv_exactly(sock, size)
+
+
+def send_response(sock: socket.socket, result: DayOutput) -> None:
+    body = json.dumps(asdict(result)).encode()
+    sock.sendall(RESPONSE_HEADER.pack(len(body)) + body)
+
+
+def recv_response(sock: socket.socket) -> DayOutput:
+    (size,) = RESPONSE_HEADER.unpack(recv_exactly(sock, RESPONSE_HEADER.size))
+    return DayOutput(**json.loads(recv_exactly(sock, size)))
+
+
+class ServerRunning(Exception):
+    pass
+
+
+# Set in each worker by init_server_worker
+_started: "multiprocessing.synchronize.Barrier | None" = None
+
+
+def init_server_worker(
+    memory_limit: int | None, started: "multiprocessing.synchronize.Barrier"
+) -> None:
+    global _started
+    # Ctrl-C stops the server, which shuts down the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    init_worker(memory_limit)
+    for day in solvers:
+        try:
+            solvers[day]
+        except ImportError:
+            # Reported when the day is requested
+            pass
+    _started = started
+
+
+def wait_for_workers() -> None:
+    """Block until every worker has been initialized and is waiting here."""
+    assert _started is not None
+    _started.wait(timeout=60)
+
+
+def remove_stale_socket(path: Path) -> None:
+    """Remove a socket left behind by a server which is no longer running.
+
+    Raises ServerRunning if a server is still listening on path.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(os.fspath(path))
+        except FileNotFoundError:
+            return
+        except ConnectionRefusedError:
+            path.unlink(missing_ok=True)
+            return
+    raise ServerRunning(f"A server is already listening on {path}")
+
+
+class Client:
+    def __init__(self, path: Path) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(os.fspath(path))
+
+    def solve(self, day: int, data: bytes) -> DayOutput:
+        send_request(self.sock, day, data)
+        return recv_response(self.sock)
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class RequestHandler(socketserver.BaseRequestHandler):
+    server: "SolverServer"
+
+    def handle(self) -> None:
+        while (request := recv_request(self.request)) is not None:
+            day, data = request
+            if day not in solvers:
+                result = DayOutput(day, "", 0, f"Day {day} is unimplemented!")
+            else:
+                future = self.server.executor.submit(
+                    run_input, day, data, 0, self.server.solve_timeout
+                )
+                result = future.result()
+            send_response(self.request, result)
+
+
+class SolverServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Serve each connection on a thread, solving in a pool of worker
+    processes which have already imported every solver.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        jobs: int,
+        timeout: float | None,
+        memory_limit: int | None,
+    ) -> None:
+        remove_stale_socket(path)
+        self.solve_timeout = timeout
+        started = multiprocessing.Barrier(jobs)
+        self.executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_server_worker,
+            initargs=(memory_limit, started),
+        )
+        # Start every worker now, so the first requests don't wait for
+        # imports. Each call waits for the others, so they must all be on
+        # different workers, and initialized.
+        try:
+            for future in [self.executor.submit(wait_for_workers) for _ in range(jobs)]:
+                future.result()
+        except BrokenBarrierError:
+            self.executor.shutdown(cancel_futures=True)
+            raise
+        super().__init__(os.fspath(path), RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.executor.shutdown(cancel_futures=True)
+        Path(self.server_address).unlink(missing_ok=True)  # type: ignore[arg-type]
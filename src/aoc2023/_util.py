@@ -1,9 +1,25 @@
-from collections import deque
-from collections.abc import Iterable, Iterator
-from functools import cached_property, lru_cache
-from typing import Self, cast, overload
-
-from attrs import define
+import hashlib
+import json
+import mmap
+import operator
+import os
+import pickle
+import re
+import sys
+import time
+import weakref
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from functools import cache, cached_property, lru_cache, update_wrapper
+from typing import IO, TYPE_CHECKING, Any, Literal, Protocol, Self, cast, overload
+
+from attrs import define, field
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 
 def tail[T](n: int, iterable: Iterable[T]) -> Iterator[T]:
@@ -37,39 +53,268 @@ def last[T](iterable: Iterable[T], *, default: T | _Sentinel = DEFAULT) -> T:
         return cast(T, default)
 
 
-@define(frozen=True)
-class Vector[T: (float, int)]:
-    x: T
-    y: T
+# Parsing works on whole inputs at once: a single pass over the text in C is
+# much faster than splitting and converting line by line.
+
+# A minus straight after a digit separates numbers rather than being a sign
+_INT = re.compile(r"(?<!\d)-?\d+")
+# Everything but digits, minus signs and newlines becomes a space
+_NUMERIC_ONLY = bytes(c if chr(c) in "0123456789-\n" else ord(" ") for c in range(256))
+# Hyphens which aren't the sign of a number, e.g. in "seed-to-soil" or "1-2"
+_STRAY_MINUS = re.compile(rb"-(?!\d)|(?<=\d)-")
+
+
+def _numeric(text: str | bytes | mmap.mmap) -> bytes | None:
+    """Return text with everything but integers replaced by whitespace, or
+    None if it has hyphens that would be mistaken for signs.
+    """
+    data = text.encode() if isinstance(text, str) else text[:]
+    if _STRAY_MINUS.search(data):
+        return None
+    return data.translate(_NUMERIC_ONLY)
+
+
+def _text(text: str | bytes | mmap.mmap) -> str:
+    return text if isinstance(text, str) else text[:].decode()
+
+
+def ints(text: str | bytes | mmap.mmap) -> list[int]:
+    """Return every integer in text, in order."""
+    data = _numeric(text)
+    if data is None:
+        return list(map(int, _INT.findall(_text(text))))
+    return list(map(int, data.split()))
+
+
+def int_rows(text: str | bytes | mmap.mmap) -> list[list[int]]:
+    """Return the integers of each non-empty line of text."""
+    data = _numeric(text)
+    if data is None:
+        findall = _INT.findall
+        return [
+            list(map(int, findall(line))) for line in _text(text).splitlines() if line
+        ]
+    return [list(map(int, line.split())) for line in data.splitlines() if line]
+
+
+@cache
+def _line_pattern(pattern: str) -> re.Pattern[str]:
+    return re.compile(f"^(?:{pattern})$", re.MULTILINE)
+
+
+def records(pattern: str, text: str) -> list[tuple[str, ...]]:
+    """Match pattern against every non-empty line of text, returning the
+    groups of each match.
+
+    The whole text is matched in one pass with a compiled, cached pattern.
+    Raises ValueError if a line doesn't match.
+    """
+    compiled = _line_pattern(pattern)
+    found = compiled.findall(text)
+    lines = text.splitlines()
+    if len(found) != sum(1 for line in lines if line):
+        for number, line in enumerate(lines, start=1):
+            if line and compiled.fullmatch(line) is None:
+                raise ValueError(f"Line {number} doesn't match {pattern!r}: {line!r}")
+    if compiled.groups == 1:
+        return [(group,) for group in found]
+    return found
+
+
+class Vector[T: float](tuple[T, T]):
+    """An (x, y) pair.
+
+    Vectors are tuples, so construction, hashing and equality are as cheap as
+    for a plain tuple, and they can be unpacked with ``x, y = vector``.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, x: T, y: T) -> Self:
+        return tuple.__new__(cls, (x, y))
+
+    def __getnewargs__(self) -> tuple[T, T]:
+        return self[0], self[1]
 
-    def __add__(self, other: Self) -> Self:
+    @property
+    def x(self) -> T:
+        return self[0]
+
+    @property
+    def y(self) -> T:
+        return self[1]
+
+    def __repr__(self) -> str:
+        return f"Vector(x={self[0]!r}, y={self[1]!r})"
+
+    def __add__(self, other: "Vector[T]") -> "Vector[T]":  # type: ignore[override]
         if isinstance(other, Vector):
-            return Vector(self.x + other.x, self.y + other.y)
+            return tuple.__new__(Vector, (self[0] + other[0], self[1] + other[1]))
 
         return NotImplemented
 
-    def __sub__(self, other: Self) -> Self:
+    def __sub__(self, other: "Vector[T]") -> "Vector[T]":
         if isinstance(other, Vector):
-            return Vector(self.x - other.x, self.y - other.y)
+            return tuple.__new__(Vector, (self[0] - other[0], self[1] - other[1]))
 
         return NotImplemented
 
 
-class Grid[T]:
+# Offsets of the four orthogonal neighbours of a cell
+ORTHOGONAL_OFFSETS = [(1, 0), (0, 1), (-1, 0), (0, -1)]
+
+# Offsets of the eight neighbours of a cell, in the order Grid.neighbours
+# returns them
+NEIGHBOUR_OFFSETS = [
+    (1, 0),
+    (1, 1),
+    (0, 1),
+    (-1, 1),
+    (-1, 0),
+    (-1, -1),
+    (0, -1),
+    (1, -1),
+]
+
+
+class NeighbourTable:
+    """In-bounds neighbours of every cell of a grid, in compressed sparse row
+    form.
+
+    Cells are flat indices y * stride + x. The neighbours of cell i are
+    indices[starts[i]:starts[i + 1]], in the order of the offsets the table
+    was built from. Cells in the padding between rows have no neighbours.
+    Both are arrays of C ints, which take a fraction of the memory of lists.
+    """
+
+    def __init__(self, starts: array[int], indices: array[int]) -> None:
+        self.starts = starts
+        self.indices = indices
+
+    def __getitem__(self, cell: int) -> array[int]:
+        return self.indices[self.starts[cell] : self.starts[cell + 1]]
+
+    def many(self, cells: Iterable[int]) -> list[array[int]]:
+        """Neighbours of each of cells."""
+        starts = self.starts
+        indices = self.indices
+        return [indices[starts[cell] : starts[cell + 1]] for cell in cells]
+
+    def adjacent(self, cells: Iterable[int]) -> set[int]:
+        """Every cell which neighbours any of cells."""
+        starts = self.starts
+        indices = self.indices
+        adjacent: set[int] = set()
+        for cell in cells:
+            adjacent.update(indices[starts[cell] : starts[cell + 1]])
+        return adjacent
+
+
+@lru_cache(maxsize=8)
+def neighbour_table(
+    width: int, height: int, stride: int, *, diagonal: bool = True
+) -> NeighbourTable:
+    """Build the neighbour table for a grid, reusing it for the last few
+    shapes.
+    """
+    offsets = NEIGHBOUR_OFFSETS if diagonal else ORTHOGONAL_OFFSETS
+    deltas = [dy * stride + dx for dx, dy in offsets]
+    # Filled in place a row at a time, since lists of the whole table would
+    # take ten times the memory
+    starts = array("i", [0]) * (height * stride + 1)
+    indices = array("i")
+
+    def add_edge_cell(x: int, y: int) -> None:
+        i = y * stride + x
+        indices.extend(
+            i + delta
+            for (dx, dy), delta in zip(offsets, deltas)
+            if 0 <= x + dx < width and 0 <= y + dy < height
+        )
+        starts[i + 1] = len(indices)
+
+    for y in range(height):
+        row = y * stride
+        if 0 < y < height - 1 and width > 2:
+            # Cells away from the edges have every neighbour, so the inside
+            # of the row can be filled in one go
+            add_edge_cell(0, y)
+            lo = row + 1
+            hi = row + width - 1
+            base = len(indices)
+            indices.extend([i + delta for i in range(lo, hi) for delta in deltas])
+            starts[lo + 1 : hi + 1] = array(
+                "i", range(base + len(deltas), len(indices) + 1, len(deltas))
+            )
+            add_edge_cell(width - 1, y)
+        else:
+            for x in range(width):
+                add_edge_cell(x, y)
+        # Padding between rows has no neighbours
+        starts[row + width + 1 : row + stride + 1] = array("i", [len(indices)]) * (
+            stride - width
+        )
+    return NeighbourTable(starts, indices)
+
+
+class _FlatIndex:
+    """Conversions between locations and flat cell indices, and neighbour
+    lookups using a precomputed NeighbourTable.
+    """
+
+    width: int
+    height: int
+    stride: int
+
+    def in_bounds(self, loc: Vector[int] | tuple[int, int]) -> bool:
+        x, y = loc
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def cell(self, loc: Vector[int] | tuple[int, int]) -> int:
+        """Flat index of loc, raising IndexError if it's out of bounds."""
+        x, y = loc
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{loc} is out of bounds")
+        return y * self.stride + x
+
+    def location(self, cell: int) -> Vector[int]:
+        y, x = divmod(cell, self.stride)
+        return Vector(x, y)
+
+    def neighbour_table(self, *, diagonal: bool = True) -> NeighbourTable:
+        return neighbour_table(self.width, self.height, self.stride, diagonal=diagonal)
+
+    def neighbours(self, loc: Vector[int]) -> Iterable[Vector[int]]:
+        table = self.neighbour_table()
+        return [self.location(cell) for cell in table[self.cell(loc)]]
+
+    def neighbours_many(
+        self, locs: Iterable[Vector[int]], *, diagonal: bool = True
+    ) -> list[list[Vector[int]]]:
+        """Neighbours of each of locs."""
+        table = self.neighbour_table(diagonal=diagonal)
+        location = self.location
+        return [
+            [location(cell) for cell in cells]
+            for cells in table.many(map(self.cell, locs))
+        ]
+
+
+class Grid[T](_FlatIndex):
     def __init__(self, grid: list[list[T]]) -> None:
         self._grid = grid
 
     @cached_property
-    def width(self) -> int:
+    def width(self) -> int:  # type: ignore[override]
         return len(self._grid[0])
 
     @cached_property
-    def height(self) -> int:
+    def height(self) -> int:  # type: ignore[override]
         return len(self._grid)
 
-    @lru_cache
-    def in_bounds(self, loc: Vector[int]) -> bool:
-        return 0 <= loc.x < self.width and 0 <= loc.y < self.height
+    @property
+    def stride(self) -> int:  # type: ignore[override]
+        return self.width
 
     def __iter__(self) -> Iterator[list[T]]:
         return iter(self._grid)
@@ -83,22 +328,6 @@ class Grid[T]:
     def __str__(self) -> str:
         return "\n".join("".join(map(str, row)) for row in self._grid)
 
-    def neighbours(self, loc: Vector[int]) -> Iterable[Vector[int]]:
-        neighbours = [
-            Vector(loc.x + 1, loc.y),
-            Vector(loc.x + 1, loc.y + 1),
-            Vector(loc.x, loc.y + 1),
-            Vector(loc.x - 1, loc.y + 1),
-            Vector(loc.x - 1, loc.y),
-            Vector(loc.x - 1, loc.y - 1),
-            Vector(loc.x, loc.y - 1),
-            Vector(loc.x + 1, loc.y - 1),
-        ]
-
-        for loc in neighbours:
-            if self.in_bounds(loc):
-                yield loc
-
     def rows(self) -> Iterator[Iterator[T]]:
         for row in self._grid:
             yield iter(row)
@@ -106,3 +335,596 @@ class Grid[T]:
     def columns(self) -> Iterator[Iterator[T]]:
         for x in range(0, self.width):
             yield (self._grid[y][x] for y in range(0, self.height))
+
+
+class ByteGrid(_FlatIndex):
+    """Grid of single-byte characters stored in one flat bytearray.
+
+    Rows are stride bytes apart, so input bytes can be loaded as they are,
+    with the newline after each row as padding. Cells can be indexed by
+    Vector, (x, y) or flat index (see index), and are returned as one
+    character strings like Grid[str].
+    """
+
+    def __init__(
+        self, data: bytearray, width: int, height: int, stride: int | None = None
+    ) -> None:
+        self._data = data
+        self.width = width
+        self.height = height
+        self.stride = width if stride is None else stride
+
+    @classmethod
+    def from_bytes(cls, data: bytes | bytearray | mmap.mmap) -> Self:
+        """Load a grid from text with newline-terminated rows of equal length.
+
+        Lines may end with \n or \r\n, the line ending is padding either way.
+        """
+        end = data.find(b"\n")
+        if end == -1:
+            return cls(bytearray(data), len(data), 1)
+        stride = end + 1
+        width = end - 1 if end and data[end - 1] == ord("\r") else end
+        # The last row's line ending is optional
+        height = (len(data) - width) // stride + 1
+        return cls(bytearray(data), width, height, stride)
+
+    def __getitem__(self, loc: Vector[int] | tuple[int, int] | int) -> str:
+        if isinstance(loc, int):
+            return chr(self._data[loc])
+        x, y = loc
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{loc} is out of bounds")
+        return chr(self._data[y * self.stride + x])
+
+    def __setitem__(self, loc: Vector[int] | tuple[int, int] | int, value: str) -> None:
+        i = loc if isinstance(loc, int) else self.cell(loc)
+        self._data[i] = ord(value)
+
+    def __iter__(self) -> Iterator[str]:
+        for y in range(self.height):
+            start = y * self.stride
+            yield self._data[start : start + self.width].decode()
+
+    def __str__(self) -> str:
+        return "\n".join(self)
+
+    def rows(self) -> Iterator[Iterator[str]]:
+        for row in self:
+            yield iter(row)
+
+    def columns(self) -> Iterator[Iterator[str]]:
+        for x in range(self.width):
+            column = self._data[x : self.height * self.stride : self.stride]
+            yield iter(column.decode())
+
+    def array(self) -> "npt.NDArray[np.uint8]":
+        """View the cells as a (height, width) NumPy array, without copying."""
+        import numpy as np
+
+        size = (self.height - 1) * self.stride + self.width
+        flat = np.frombuffer(self._data, dtype=np.uint8, count=size)
+        return np.lib.stride_tricks.as_strided(
+            flat, shape=(self.height, self.width), strides=(self.stride, 1)
+        )
+
+
+type MemoScope = Literal["call", "object", "global"]
+
+
+@define
+class MemoStats:
+    """Counters for a memoized function, accumulated across its caches."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    # Largest a single cache has been. Bytes are only measured for caches
+    # bounded by maxbytes.
+    peak_entries: int = 0
+    peak_bytes: int = 0
+    # Adds the counts of caches still in use, before the stats are read
+    sync: Callable[[], None] | None = field(default=None, repr=False, eq=False)
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+# Stats of every memoized function, by qualified name
+memo_stats: dict[str, MemoStats] = {}
+
+_MISSING = _Sentinel()
+_KWARGS_MARK = _Sentinel()
+
+
+class _LruCaches:
+    """The functools.lru_cache caches of a memoized function, whose counts
+    are added to its stats as each cache is dropped, or when the stats are
+    read while it's still in use.
+    """
+
+    def __init__(self, stats: MemoStats, maxsize: int | None) -> None:
+        self.stats = stats
+        self.maxsize = maxsize
+        # Caches in use, by key, with the hits and misses already added
+        self.live: dict[int, tuple[Any, int, int]] = {}
+
+    def new[**P, R](self, fn: Callable[P, R], key: int | None = None) -> Any:
+        cache = lru_cache(maxsize=self.maxsize)(fn)
+        if key is not None:
+            self.live[key] = cache, 0, 0
+        return cache
+
+    def add(self, cache: Any, hits: int = 0, misses: int = 0) -> tuple[int, int]:
+        info = cache.cache_info()
+        self.stats.hits += info.hits - hits
+        self.stats.misses += info.misses - misses
+        if self.maxsize is not None:
+            # Caches never shrink, so every other miss evicted an entry
+            evictions = max(0, info.misses - info.currsize)
+            self.stats.evictions += evictions - max(0, misses - info.currsize)
+        self.stats.peak_entries = max(self.stats.peak_entries, info.currsize)
+        return info.hits, info.misses
+
+    def drop(self, key: int) -> None:
+        # Already gone if the caches were cleared
+        if (entry := self.live.pop(key, None)) is not None:
+            self.add(*entry)
+
+    def sync(self) -> None:
+        for key, (lru, hits, misses) in self.live.items():
+            self.live[key] = lru, *self.add(lru, hits, misses)
+
+
+class _MemoCache:
+    """Cached results, evicting the least recently used once there are more
+    than maxsize of them or they take more than maxbytes.
+
+    Sizes are shallow (sys.getsizeof of the key and value), which is exact
+    for the strings, ints and tuples of ints that solvers memoize on.
+    """
+
+    __slots__ = ("entries", "sizes", "nbytes", "stats", "maxsize", "maxbytes")
+
+    def __init__(self, stats: MemoStats, maxsize: int | None, maxbytes: int) -> None:
+        self.entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.sizes: dict[Hashable, int] = {}
+        self.nbytes = 0
+        self.stats = stats
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Add the result of a miss."""
+        self.stats.misses += 1
+        entries = self.entries
+        entries[key] = value
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        # A recursive call may have already cached key
+        self.nbytes += size - self.sizes.get(key, 0)
+        self.sizes[key] = size
+        while (self.maxsize is not None and len(entries) > self.maxsize) or (
+            self.nbytes > self.maxbytes
+        ):
+            evicted, _ = entries.popitem(last=False)
+            self.nbytes -= self.sizes.pop(evicted, 0)
+            self.stats.evictions += 1
+        self.stats.peak_entries = max(self.stats.peak_entries, len(entries))
+        self.stats.peak_bytes = max(self.stats.peak_bytes, self.nbytes)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.sizes.clear()
+        self.nbytes = 0
+
+
+class Memoized[**P, R](Protocol):
+    """A function whose results are cached, see memoize."""
+
+    stats: MemoStats
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        ...
+
+    def cache_clear(self) -> None:
+        """Drop the results of the global and object scopes."""
+
+
+def memoize[
+    **P, R
+](
+    *,
+    scope: MemoScope = "global",
+    maxsize: int | None = None,
+    maxbytes: int | None = None,
+) -> Callable[[Callable[P, R]], Memoized[P, R]]:
+    """Cache the results of a function by its (hashable) arguments.
+
+    The scope decides how long results are kept:
+
+    - "call": until the outermost call returns, so recursive calls share a
+      cache which is then freed.
+    - "object": for a method, per instance for as long as the instance lives.
+    - "global": for the life of the process.
+
+    Each cache holds at most maxsize entries and maxbytes bytes, evicting the
+    least recently used. Hits, misses and evictions are recorded in
+    memo_stats. Caches are not thread-safe.
+    """
+
+    def decorator(fn: Callable[P, R]) -> Memoized[P, R]:
+        stats = memo_stats.setdefault(f"{fn.__module__}.{fn.__qualname__}", MemoStats())
+        if maxbytes is None:
+            wrapper = lru_memoize(fn, stats, scope, maxsize)
+        else:
+            wrapper = bytes_memoize(fn, stats, scope, maxsize, maxbytes)
+        wrapper.stats = stats  # type: ignore[attr-defined]
+        return cast(Memoized[P, R], wrapper)
+
+    return decorator
+
+
+def lru_memoize[
+    **P, R
+](
+    fn: Callable[P, R], stats: MemoStats, scope: MemoScope, maxsize: int | None
+) -> Callable[P, R]:
+    """memoize with functools.lru_cache, reading its stats from cache_info."""
+    caches = _LruCaches(stats, maxsize)
+    stats.sync = caches.sync
+    # The global cache is the wrapper itself, so it costs nothing per call.
+    # It's kept under 0, which is never an object's id.
+    global_cache = caches.new(fn, key=0)
+    active: Any = None
+
+    def call_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        nonlocal active
+        if active is not None:
+            return active(*args, **kwargs)
+        # The outermost call owns the cache, recursive calls share it
+        cache = active = caches.new(fn)
+        try:
+            return cache(*args, **kwargs)
+        finally:
+            active = None
+            caches.add(cache)
+
+    def object_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        obj = args[0]
+        entry = caches.live.get(id(obj))
+        if entry is None:
+            # Don't keep obj alive, and don't let a later object with the
+            # same id see its results
+            ref = weakref.ref(obj)
+
+            def method(*rest: Any, **named: Any) -> R:
+                return cast(Callable[..., R], fn)(ref(), *rest, **named)
+
+            cache = caches.new(method, key=id(obj))
+            weakref.finalize(obj, caches.drop, id(obj))
+        else:
+            cache = entry[0]
+        return cache(*args[1:], **kwargs)
+
+    # Replaced on the global cache below
+    clear_global = global_cache.cache_clear
+
+    def cache_clear() -> None:
+        caches.sync()
+        clear_global()
+        # Objects' caches are dropped, their counts are already in stats
+        caches.live = {0: (global_cache, 0, 0)}
+
+    wrapper: Any
+    if scope == "global":
+        wrapper = global_cache
+    else:
+        wrapper = update_wrapper(
+            call_wrapper if scope == "call" else object_wrapper, fn
+        )
+    wrapper.cache_clear = cache_clear
+    return cast(Callable[P, R], wrapper)
+
+
+def bytes_memoize[
+    **P, R
+](
+    fn: Callable[P, R],
+    stats: MemoStats,
+    scope: MemoScope,
+    maxsize: int | None,
+    maxbytes: int,
+) -> Callable[P, R]:
+    """memoize with a pure Python cache, which can measure its entries."""
+    global_cache = _MemoCache(stats, maxsize, maxbytes)
+    active: _MemoCache | None = None
+    objects: dict[int, _MemoCache] = {}
+
+    # The wrappers are hot, so each scope has its own and the lookup is
+    # inlined in each
+
+    def global_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        key = (*args, _KWARGS_MARK, *kwargs.items()) if kwargs else args
+        value = global_cache.entries.get(key, _MISSING)
+        if value is _MISSING:
+            value = fn(*args, **kwargs)
+            global_cache.put(key, value)
+        else:
+            stats.hits += 1
+            global_cache.entries.move_to_end(key)
+        return value
+
+    def call_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        nonlocal active
+        cache = active
+        if cache is None:
+            # The outermost call owns the cache, recursive calls share it
+            cache = active = _MemoCache(stats, maxsize, maxbytes)
+            try:
+                value = fn(*args, **kwargs)
+            finally:
+                active = None
+            stats.misses += 1
+            return value
+        key = (*args, _KWARGS_MARK, *kwargs.items()) if kwargs else args
+        value = cache.entries.get(key, _MISSING)
+        if value is _MISSING:
+            value = fn(*args, **kwargs)
+            cache.put(key, value)
+        else:
+            stats.hits += 1
+            cache.entries.move_to_end(key)
+        return value
+
+    def object_wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        obj = args[0]
+        cache = objects.get(id(obj))
+        if cache is None:
+            cache = objects[id(obj)] = _MemoCache(stats, maxsize, maxbytes)
+            # Don't keep obj alive, and don't let a later object with the
+            # same id see its results
+            weakref.finalize(obj, objects.pop, id(obj), None)
+        key = args[1:]
+        if kwargs:
+            key = (*key, _KWARGS_MARK, *kwargs.items())
+        value = cache.entries.get(key, _MISSING)
+        if value is _MISSING:
+            value = fn(*args, **kwargs)
+            cache.put(key, value)
+        else:
+            stats.hits += 1
+            cache.entries.move_to_end(key)
+        return value
+
+    def cache_clear() -> None:
+        global_cache.clear()
+        objects.clear()
+
+    wrapper = {
+        "global": global_wrapper,
+        "call": call_wrapper,
+        "object": object_wrapper,
+    }[scope]
+    update_wrapper(wrapper, fn)
+    wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+    return wrapper
+
+
+def reset_memo_stats() -> None:
+    # Reset in place, since each Memoized holds on to its stats
+    for stats in memo_stats.values():
+        if stats.sync is not None:
+            stats.sync()
+        stats.hits = stats.misses = stats.evictions = 0
+        stats.peak_entries = stats.peak_bytes = 0
+
+
+def write_memo_stats(file: IO[str]) -> None:
+    """Write the stats of each memoized function that has been called."""
+    for name, stats in memo_stats.items():
+        if stats.sync is not None:
+            stats.sync()
+        if not stats.hits + stats.misses:
+            continue
+        peak = f"peak {stats.peak_entries} entries"
+        if stats.peak_bytes:
+            peak += f" / {stats.peak_bytes} bytes"
+        print(
+            f"memo {name}: {stats.hits} hits, {stats.misses} misses "
+            f"({stats.hit_rate:.1%}), {stats.evictions} evictions, {peak}",
+            file=file,
+        )
+
+
+@define(frozen=True)
+class Cycle[S]:
+    """Where the states of a simulation start repeating."""
+
+    # Steps before the cycle, and the cycle's length. If the cycle wasn't
+    # found within the requested number of steps, start is that number and
+    # period is None.
+    start: int
+    period: int | None
+    # The state after the requested number of steps
+    state: S
+
+
+def find_cycle[
+    S
+](
+    step: Callable[[S], S],
+    initial: S,
+    n: int,
+    *,
+    method: Literal["hash", "brent"] = "hash",
+    key: Callable[[S], bytes] | None = None,
+) -> Cycle[S]:
+    """Find the cycle in the states step generates from initial, and the
+    state after n steps, without simulating all n.
+
+    With method="hash", each state is stored only as a 16 byte digest of
+    key(state), which defaults to pickling it. Keys which pack the state
+    tightly (e.g. as a bitboard) are cheaper to hash.
+
+    With method="brent", only two states are kept and states are compared
+    with ==, or by key if given. This steps more often than hashing, but
+    never confuses states.
+    """
+    if method == "brent":
+        return _find_cycle_brent(step, initial, n, key)
+
+    digest = key or pickle.dumps
+    seen: dict[bytes, int] = {}
+    state = initial
+    for i in range(n):
+        h = hashlib.blake2b(digest(state), digest_size=16).digest()
+        start = seen.setdefault(h, i)
+        if start != i:
+            period = i - start
+            for _ in range((n - i) % period):
+                state = step(state)
+            return Cycle(start, period, state)
+        state = step(state)
+    return Cycle(n, None, state)
+
+
+def _find_cycle_brent[
+    S
+](
+    step: Callable[[S], S],
+    initial: S,
+    n: int,
+    key: Callable[[S], bytes] | None,
+) -> Cycle[S]:
+    same: Callable[[S, S], bool] = (
+        operator.eq if key is None else lambda a, b: key(a) == key(b)
+    )
+
+    if n == 0:
+        return Cycle(0, None, initial)
+
+    # Find the period, by moving the tortoise to the hare every power of two
+    # steps until the hare comes back around to it
+    power = period = 1
+    tortoise = initial
+    hare = step(initial)
+    steps = 1
+    while not same(tortoise, hare):
+        if steps >= n:
+            return Cycle(n, None, hare)
+        if power == period:
+            tortoise = hare
+            power *= 2
+            period = 0
+        hare = step(hare)
+        steps += 1
+        period += 1
+
+    # Find the start, with the hare a period ahead of the tortoise
+    tortoise = hare = initial
+    for _ in range(period):
+        hare = step(hare)
+    start = 0
+    while not same(tortoise, hare):
+        tortoise = step(tortoise)
+        hare = step(hare)
+        start += 1
+
+    if n < start:
+        state = initial
+        for _ in range(n):
+            state = step(state)
+        return Cycle(start, period, state)
+
+    state = tortoise
+    for _ in range((n - start) % period):
+        state = step(state)
+    return Cycle(start, period, state)
+
+
+class Tracer:
+    """Records spans and counters as Chrome trace events.
+
+    The output can be loaded in chrome://tracing or https://ui.perfetto.dev
+    """
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        self.counters: dict[str, int] = {}
+        self._pid = os.getpid()
+        self._start = time.perf_counter_ns()
+
+    def _now(self) -> float:
+        """Microseconds since the tracer was created"""
+        return (time.perf_counter_ns() - self._start) / 1000
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        start = self._now()
+        try:
+            yield
+        finally:
+            self.events.append(
+                dict(
+                    name=name,
+                    ph="X",
+                    ts=start,
+                    dur=self._now() - start,
+                    pid=self._pid,
+                    tid=0,
+                )
+            )
+
+    def count(self, name: str, n: int = 1) -> None:
+        value = self.counters[name] = self.counters.get(name, 0) + n
+        self.events.append(
+            dict(
+                name=name,
+                ph="C",
+                ts=self._now(),
+                pid=self._pid,
+                tid=0,
+                args={name: value},
+            )
+        )
+
+    def write(self, file: IO[str]) -> None:
+        json.dump(
+            dict(traceEvents=self.events, otherData=dict(counters=self.counters)),
+            file,
+        )
+
+
+_tracer: Tracer | None = None
+_no_span = nullcontext()
+
+
+def span(name: str) -> AbstractContextManager[None]:
+    """Trace a phase of a solver, e.g. ``with span("part 1"):``"""
+    if _tracer is None:
+        return _no_span
+    return _tracer.span(name)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Add n to a named counter.
+
+    This is cheap when tracing is disabled, but in hot loops prefer counting
+    locally and calling this once afterwards.
+    """
+    if _tracer is not None:
+        _tracer.count(name, n)
+
+
+@contextmanager
+def tracing() -> Iterator[Tracer]:
+    """Enable span and count for the duration of the context."""
+    global _tracer
+    previous = _tracer
+    _tracer = tracer = Tracer()
+    try:
+        yield tracer
+    finally:
+        _tracer = previous
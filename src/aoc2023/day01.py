@@ -1,9 +1,10 @@
-import re
-from collections.abc import Iterable, Iterator
+from collections import deque
+from collections.abc import Iterable, Mapping
 from typing import IO
 
 from ._registry import register
-from ._util import last
+
+digits = {d: d for d in "0123456789"}
 
 digit_words = {
     "one": "1",
@@ -17,34 +18,94 @@ digit_words = {
     "nine": "9",
 }
 
-re_digit_words = re.compile(f"({'|'.join(digit_words)})")
 
+class Automaton:
+    """Aho-Corasick automaton for a set of patterns, compiled to a DFA so that
+    each character is a single transition, and overlapping matches (e.g. "one"
+    in "twone") are all seen.
+    """
+
+    def __init__(self, patterns: Mapping[str, str]) -> None:
+        # Transitions of each state, where characters missing from a state
+        # go back to the start
+        self.delta: list[dict[str, int]] = [{}]
+        # Length and value of the longest pattern ending at each state
+        self.output: list[tuple[int, str] | None] = [None]
+        self.max_length = max(map(len, patterns))
+
+        for pattern, value in patterns.items():
+            state = 0
+            for c in pattern:
+                if c not in self.delta[state]:
+                    self.delta[state][c] = len(self.delta)
+                    self.delta.append({})
+                    self.output.append(None)
+                state = self.delta[state][c]
+            self.output[state] = (len(pattern), value)
+
+        # Breadth first, so that a state's failure state is complete before
+        # the state's own transitions are filled in from it
+        alphabet = {c for pattern in patterns for c in pattern}
+        fail = [0] * len(self.delta)
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            children = list(self.delta[state].items())
+            for c, child in children:
+                fail[child] = 0 if state == 0 else self.delta[fail[state]].get(c, 0)
+                if self.output[child] is None:
+                    self.output[child] = self.output[fail[child]]
+                queue.append(child)
+            if state != 0:
+                for c in alphabet - self.delta[state].keys():
+                    if (target := self.delta[fail[state]].get(c, 0)) != 0:
+                        self.delta[state][c] = target
+
+    def find(self, chars: Iterable[str]) -> str | None:
+        """Return the value of the match which starts first in chars."""
+        delta = self.delta
+        output = self.output
+        state = 0
+        best_start = -1
+        best = None
+        for i, c in enumerate(chars):
+            # Matches ending from here on start after the best one
+            if best is not None and i - self.max_length >= best_start:
+                break
+            state = delta[state].get(c, 0)
+            if (match := output[state]) is not None:
+                length, value = match
+                if best is None or i - length + 1 < best_start:
+                    best_start = i - length + 1
+                    best = value
+        return best
+
+
+class Scanner:
+    """Finds the first and last patterns in a line, scanning from each end
+    only as far as the first match.
+    """
+
+    def __init__(self, patterns: Mapping[str, str]) -> None:
+        self.forward = Automaton(patterns)
+        self.backward = Automaton({p[::-1]: value for p, value in patterns.items()})
 
-def digits(s: str, /, *, words: bool = False) -> Iterator[str]:
-    for i in range(len(s)):
-        if s[i].isdigit():
-            yield s[i]
-        elif words and (match := re_digit_words.match(s[i:])):
-            yield digit_words[match[1]]
+    def calibration_value(self, line: str) -> int:
+        first = self.forward.find(line)
+        last = self.backward.find(reversed(line))
+        assert first is not None and last is not None, line
+        return int(first + last)
 
 
-def first_last[T](iterable: Iterable[T]) -> tuple[T, T]:
-    iterator = iter(iterable)
-    first = next(iterator)
-    return first, last(iterator, default=first)
+digit_scanner = Scanner(digits)
+word_scanner = Scanner(digits | digit_words)
 
 
 @register(day=1)
 def solve(file: IO[str], verbose: int) -> None:
-    lines = file.readlines()
-    total = 0
-    for line in lines:
-        value = int("".join(first_last(digits(line))))
-        total += value
-    print("Part 1:", total)
-
-    total = 0
-    for line in lines:
-        value = int("".join(first_last(digits(line, words=True))))
-        total += value
-    print("Part 2:", total)
+    part1 = part2 = 0
+    for line in file:
+        part1 += digit_scanner.calibration_value(line)
+        part2 += word_scanner.calibration_value(line)
+    print("Part 1:", part1)
+    print("Part 2:", part2)
@@ -1,35 +1,204 @@
-import math
-from typing import IO
+import re
+from collections.abc import Iterable, Sequence
+from typing import IO, Self
 
-from ._registry import register
-from ._rust.day02 import Colour, parse_game
+import numpy as np
+import numpy.typing as npt
+from attrs import define
+
+from ._registry import InputBuffer, register
+
+try:
+    from ._rust.day02 import parse_games
+except ImportError:
+    HAVE_RUST = False
+else:
+    HAVE_RUST = True
+
+CUBES = {"red": 12, "green": 13, "blue": 14}
+COLOURS = list(CUBES)
+
+re_game = re.compile(r"Game (\d+):")
+re_cubes = re.compile(r"(\d+) (red|green|blue)")
+
+
+@define
+class GameMaxima:
+    """Each game's id, and the most red, green and blue cubes (columns in
+    COLOURS order) shown at once, which is the fewest the bag could hold.
+    """
+
+    ids: npt.NDArray[np.int64]
+    min_required: npt.NDArray[np.int64]
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> Self:
+        ids = []
+        min_required = []
+        for line in lines:
+            prefix = re_game.match(line)
+            if prefix is None:
+                raise ValueError(f"invalid game: {line!r}")
+            ids.append(int(prefix[1]))
+
+            maxima = dict.fromkeys(COLOURS, 0)
+            for set_ in line[prefix.end() :].split(";"):
+                hand = dict.fromkeys(COLOURS, 0)
+                for num, colour in re_cubes.findall(set_):
+                    hand[colour] += int(num)
+                for colour, num in hand.items():
+                    maxima[colour] = max(maxima[colour], num)
+            min_required.append(list(maxima.values()))
+
+        return cls(
+            np.array(ids, dtype=np.int64),
+            np.array(min_required, dtype=np.int64).reshape(-1, 3),
+        )
+
+    @classmethod
+    def parse_rust(cls, data: InputBuffer) -> Self:
+        # Rows of game id, then the red, green and blue maxima
+        games = np.frombuffer(parse_games(data), dtype="<u4").reshape(-1, 4)
+        return cls(games[:, 0].astype(np.int64), games[:, 1:].astype(np.int64))
+
+
+# Largest dense table BagIndex builds, in cells
+DENSE_CELLS = 1 << 20
+
+
+class BagIndex:
+    """Answers which games are possible for many bags at once.
+
+    A game is possible if the bag has at least its maxima of every colour.
+    Each colour's maxima are ranked among their distinct values. When there
+    are few distinct values, as in real inputs, a cumulative table over the
+    ranks makes each bag three binary searches and a lookup. Tables are
+    limited to DENSE_CELLS cells, so with more distinct values the bags are
+    answered offline by dominance().
+    """
+
+    def __init__(self, games: GameMaxima) -> None:
+        self.values = [np.unique(column) for column in games.min_required.T]
+        # 1-based, leaving 0 for bags smaller than every game
+        self.ranks = tuple(
+            np.searchsorted(values, column) + 1
+            for values, column in zip(self.values, games.min_required.T)
+        )
+        self.ids = games.ids
+        self.shape = tuple(len(values) + 1 for values in self.values)
+        self.table: npt.NDArray[np.int64] | None = None
+        if np.prod(self.shape) <= DENSE_CELLS:
+            # Game counts and id sums in the last axis
+            self.table = np.zeros((*self.shape, 2), dtype=np.int64)
+            np.add.at(self.table, self.ranks, self.weights())
+            for axis in range(3):
+                np.cumsum(self.table, axis=axis, out=self.table)
+
+    def weights(self) -> npt.NDArray[np.int64]:
+        return np.column_stack([np.ones_like(self.ids), self.ids])
+
+    def query(
+        self, bags: npt.ArrayLike
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """Return the number of possible games and the sum of their ids, for
+        each bag of red, green and blue cubes in the (n, 3) array bags.
+        """
+        bags = np.asarray(bags, dtype=np.int64).reshape(-1, 3)
+        cells = tuple(
+            np.searchsorted(values, column, side="right")
+            for values, column in zip(self.values, bags.T)
+        )
+        if self.table is not None:
+            totals = self.table[cells]
+            return totals[:, 0], totals[:, 1]
+
+        # Split on the colours with the fewest values, to take fewest passes
+        axes = sorted(range(3), key=lambda axis: len(self.values[axis]))
+        counts, id_sums = dominance(
+            [self.ranks[axis] - 1 for axis in axes],
+            list(self.weights().T),
+            [cells[axis] for axis in axes],
+            [len(self.values[axis]) for axis in axes],
+        )
+        return counts, id_sums
+
+
+def dominance(
+    ranks: Sequence[npt.NDArray[np.intp]],
+    weights: Sequence[npt.NDArray[np.int64]],
+    cells: Sequence[npt.NDArray[np.intp]],
+    sizes: Sequence[int],
+) -> list[npt.NDArray[np.int64]]:
+    """Sum each of weights over the points whose ranks are below a query's
+    cells on all three axes, for every query.
+
+    This is CDQ divide and conquer run a level at a time. Splitting the first
+    axis's ranks in half, then the halves in half, and so on, each point is
+    below a query in exactly one split: the first bit where their ranks
+    differ, where the point's is 0 and the query's is 1. Within each split of
+    the first axis, the second axis is split the same way, leaving a 1D
+    count on the third axis in each group of the split, done with sorted
+    keys and prefix sums in place of a Fenwick tree. That's
+    O((P + Q) log^2 P) for P points and Q queries, with linear memory.
+    """
+    (point_a, point_b, point_c), (query_a, query_b, query_c) = ranks, cells
+    size_a, size_b, size_c = sizes
+    bits_b = size_b.bit_length()
+    totals = [np.zeros(len(query_a), dtype=np.int64) for _ in weights]
+    for k in range(size_a.bit_length()):
+        points_k = ((point_a >> k) & 1) == 0
+        queries_k = np.flatnonzero((query_a >> k) & 1)
+        if not points_k.any() or not len(queries_k):
+            continue
+        # Higher bits of the first axis, which must match
+        pk_a = point_a[points_k] >> (k + 1)
+        pk_b = point_b[points_k]
+        pk_c = point_c[points_k]
+        pk_weights = [w[points_k] for w in weights]
+        qk_a = query_a[queries_k] >> (k + 1)
+        qk_b = query_b[queries_k]
+        qk_c = query_c[queries_k]
+        found = [np.zeros(len(queries_k), dtype=np.int64) for _ in weights]
+
+        for bit in range(bits_b):
+            points = ((pk_b >> bit) & 1) == 0
+            queries = np.flatnonzero((qk_b >> bit) & 1)
+            if not points.any() or not len(queries):
+                continue
+            # Group by the higher bits of both axes, then order by the third
+            shift = bits_b - bit - 1
+            point_groups = (pk_a[points] << shift) | (pk_b[points] >> (bit + 1))
+            keys = point_groups * (size_c + 1) + pk_c[points]
+            order = np.argsort(keys)
+            keys = keys[order]
+            query_groups = (qk_a[queries] << shift) | (qk_b[queries] >> (bit + 1))
+            group_starts = query_groups * (size_c + 1)
+            lo = np.searchsorted(keys, group_starts)
+            hi = np.searchsorted(keys, group_starts + qk_c[queries])
+            for w, total in zip(pk_weights, found):
+                cumulative = np.zeros(len(order) + 1, dtype=np.int64)
+                np.cumsum(w[points][order], out=cumulative[1:])
+                total[queries] += cumulative[hi] - cumulative[lo]
+
+        for total, total_k in zip(totals, found):
+            total[queries_k] += total_k
+    return totals
+
+
+def report(games: GameMaxima) -> None:
+    _, id_sums = BagIndex(games).query([list(CUBES.values())])
+    print("Part 1:", id_sums[0])
+    print("Part 2:", games.min_required.prod(axis=1).sum())
 
 
 @register(day=2)
 def solve(file: IO[str], verbose: int) -> None:
-    cubes = {Colour.RED: 12, Colour.GREEN: 13, Colour.BLUE: 14}
-    empty = {Colour.RED: 0, Colour.GREEN: 0, Colour.BLUE: 0}
-
-    game_powers = []
-    possible_games = set()
-    for line in file:
-        game = parse_game(line)
-
-        min_required = empty.copy()
-        valid = True
-        for set_ in game.sets:
-            hand = empty.copy()
-            for num, colour in set_:
-                if cubes[colour] < num:
-                    valid = False
-                hand[colour] += num
-
-            for colour, num in hand.items():
-                min_required[colour] = max(min_required[colour], num)
-
-        if valid:
-            possible_games.add(game.id)
-        game_powers.append(math.prod(min_required.values()))
-
-    print("Part 1:", sum(possible_games))
-    print("Part 2:", sum(game_powers))
+    report(GameMaxima.parse(file))
+
+
+def solve_rust(data: InputBuffer, verbose: int) -> None:
+    report(GameMaxima.parse_rust(data))
+
+
+if HAVE_RUST:
+    register(day=2, buffer=True, backend="rust")(solve_rust)
@@ -1,9 +1,8 @@
 import math
 from collections import defaultdict
-from typing import IO
 
-from ._registry import register
-from ._util import Grid, Vector
+from ._registry import InputBuffer, register
+from ._util import NEIGHBOUR_OFFSETS, ByteGrid
 
 
 def is_symbol(char: str) -> bool:
@@ -11,34 +10,42 @@ def is_symbol(char: str) -> bool:
     return char != "." and not char.isdigit()
 
 
-@register(day=3)
-def solve(file: IO[str], verbose: int) -> None:
-    grid = Grid([[c for c in line.rstrip()] for line in file])
+@register(day=3, buffer=True)
+def solve(data: InputBuffer, verbose: int) -> None:
+    grid = ByteGrid.from_bytes(data)
     part_numbers = []
     width = grid.width
-    gear_numbers: defaultdict[Vector[int], list[int]] = defaultdict(list)
+    height = grid.height
+    gear_numbers: defaultdict[int, list[int]] = defaultdict(list)
     for y, row in enumerate(grid):
         number_chars = []
         is_part = False
-        cogs: set[Vector[int]] = set()
+        cogs: set[int] = set()
         for x, char in enumerate(row):
-            pos = Vector(x, y)
             isdigit = char.isdigit()
             if isdigit:
                 number_chars.append(char)
-                for loc in grid.neighbours(pos):
-                    if not is_part and is_symbol(grid[loc]):
+                # Only digits need their neighbours, so they're found here
+                # rather than from a table of every cell's
+                for dx, dy in NEIGHBOUR_OFFSETS:
+                    nx = x + dx
+                    ny = y + dy
+                    if not (0 <= nx < width and 0 <= ny < height):
+                        continue
+                    cell = ny * grid.stride + nx
+                    neighbour = grid[cell]
+                    if not is_part and is_symbol(neighbour):
                         is_part = True
-                    if grid[loc] == "*":
-                        cogs.add(loc)
+                    if neighbour == "*":
+                        cogs.add(cell)
 
             if not isdigit or x == width - 1:
                 if number_chars:
                     if is_part:
                         number = int("".join(number_chars))
                         part_numbers.append(number)
-                        for loc in cogs:
-                            gear_numbers[loc].append(number)
+                        for cell in cogs:
+                            gear_numbers[cell].append(number)
                     number_chars = []
                     is_part = False
                     cogs = set()
@@ -1,10 +1,10 @@
 from functools import cached_property
 from typing import IO
 
-import regex
 from attrs import define, field
 
 from ._registry import register
+from ._util import int_rows, ints
 
 
 @define(slots=False)
@@ -30,23 +30,12 @@ class Card:
 def solve(file: IO[str], verbose: int) -> None:
     cards: dict[int, Card] = {}
 
-    for line in file:
-        match = regex.match(
-            r"""
-            Card\s+(?P<id>\d+):\s*                    # Card <id>
-            (?P<winning>\d+)(?:\s+(?P<winning>\d+))*  # winning numbers
-            \s*\|\s*                                  # separator
-            (?P<mine>\d+)(?:\s+(?P<mine>\d+))*        # my numbers
-            \s*
-            """,
-            line,
-            regex.VERBOSE,
-        )
-        assert match is not None
-        winning = [int(s) for s in match.captures("winning")]
-        mine = [int(s) for s in match.captures("mine")]
-        card_id = int(match["id"])
-        cards[card_id] = Card(card_id, winning, mine)
+    text = file.read()
+    # Every card has as many winning numbers as the first
+    num_winning = len(ints(text[: text.index("|")])) - 1
+    for row in int_rows(text):
+        card_id = row[0]
+        cards[card_id] = Card(card_id, row[1 : num_winning + 1], row[num_winning + 1 :])
 
     print("Part 1:", sum(card.points for card in cards.values()))
 
@@ -4,6 +4,7 @@ from itertools import batched
 from typing import IO
 
 from ._registry import register
+from ._util import ints
 
 
 def map_int(source: int, source_dest_map: dict[range, range]) -> int:
@@ -56,20 +57,14 @@ def solve(file: IO[str], verbose: int) -> None:
     graph: dict[str, str] = {}
     maps: dict[tuple[str, str], dict[range, range]] = {}
 
-    current_map = None
-    seeds: list[int] = []
-    for line in file:
-        line = line.rstrip()
-        if line.startswith("seeds: "):
-            seeds = [int(n) for n in line.removeprefix("seeds: ").split()]
-        elif line.endswith(" map:"):
-            map_name = line.removesuffix(" map:")
-            source, dest = map_name.split("-to-", maxsplit=1)
-            graph[source] = dest
-            current_map = maps[source, dest] = dict()
-        elif line:
-            assert current_map is not None
-            dest_start, source_start, length = map(int, line.split())
+    seeds_block, *map_blocks = file.read().split("\n\n")
+    seeds = ints(seeds_block)
+    for block in map_blocks:
+        header, _, body = block.partition("\n")
+        source, dest = header.removesuffix(" map:").split("-to-", maxsplit=1)
+        graph[source] = dest
+        current_map = maps[source, dest] = dict()
+        for dest_start, source_start, length in batched(ints(body), 3):
             current_map[range(source_start, source_start + length)] = range(
                 dest_start, dest_start + length
             )
@@ -4,6 +4,7 @@ from typing import IO
 from numpy.polynomial import Polynomial
 
 from ._registry import register
+from ._util import ints
 
 
 def num_wins(time: int, record_distance: int) -> int:
@@ -31,12 +32,12 @@ def num_wins(time: int, record_distance: int) -> int:
 def solve(file: IO[str], verbose: int) -> None:
     line_t, line_d = file
 
-    times = [int(s) for s in line_t.removeprefix("Time:").strip().split()]
-    distances = [int(s) for s in line_d.removeprefix("Distance:").strip().split()]
+    times = ints(line_t)
+    distances = ints(line_d)
 
     print("Part 1:", math.prod(num_wins(t, r) for t, r in zip(times, distances)))
 
-    time = int(line_t.removeprefix("Time:").replace(" ", ""))
-    distance = int(line_d.removeprefix("Distance:").replace(" ", ""))
+    (time,) = ints(line_t.replace(" ", ""))
+    (distance,) = ints(line_d.replace(" ", ""))
 
     print("Part 2:", num_wins(time, distance))
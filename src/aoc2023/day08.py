@@ -1,24 +1,19 @@
 import math
-import re
 from collections.abc import Sequence
 from itertools import cycle
 from typing import IO, Literal, assert_never, cast
 
 from ._registry import register
+from ._util import records
 
 
 @register(day=8)
 def solve(file: IO[str], verbose: int) -> None:
     instructions = cast("Sequence[Literal['L', 'R']]", next(file).rstrip())
-    node_map: dict[str, tuple[str, str]] = dict()
-    for line in file:
-        line = line.rstrip()
-        if not line:
-            continue
-        match = re.match(r"([A-Z]+) = \(([A-Z]+), ([A-Z]+)\)", line)
-        assert match is not None, line
-        node, left, right = match.groups()
-        node_map[node] = left, right
+    node_map = {
+        node: (left, right)
+        for node, left, right in records(r"(\w+) = \((\w+), (\w+)\)", file.read())
+    }
 
     def steps(node):
         step = 0
@@ -3,6 +3,7 @@ from itertools import pairwise
 from typing import IO
 
 from ._registry import register
+from ._util import int_rows
 
 
 def extrapolate(history, *, backwards: bool = False):
@@ -30,11 +31,7 @@ def extrapolate(history, *, backwards: bool = False):
 
 @register(day=9)
 def solve(file: IO[str], verbose: int) -> None:
-    histories = []
-    for line in file:
-        line = line.rstrip()
-        history = deque(int(s) for s in line.split())
-        histories.append(history)
+    histories = [deque(row) for row in int_rows(file.read())]
 
     print("Part 1:", sum(extrapolate(h) for h in histories))
     print("Part 2:", sum(extrapolate(h, backwards=True) for h in histories))
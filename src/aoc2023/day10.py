@@ -1,10 +1,9 @@
 from collections import deque
 from collections.abc import Collection
 from enum import Enum
-from typing import IO
 
-from ._registry import register
-from ._util import Grid, Vector
+from ._registry import InputBuffer, register
+from ._util import ByteGrid, Vector, count, span
 
 
 class Tile(Enum):
@@ -46,87 +45,89 @@ directions = {
 }
 
 
-def inside_shape(
-    grid: Grid[Tile], shape: Collection[Vector[int]], point: Vector[int]
-) -> bool:
+# Tiles which connect back to S from its neighbour in each direction
+connects_back = {
+    NORTH: {Tile.VERTICAL, Tile.SOUTH_EAST, Tile.SOUTH_WEST},
+    EAST: {Tile.HORIZONTAL, Tile.NORTH_WEST, Tile.SOUTH_WEST},
+    SOUTH: {Tile.VERTICAL, Tile.NORTH_EAST, Tile.NORTH_WEST},
+    WEST: {Tile.HORIZONTAL, Tile.NORTH_EAST, Tile.SOUTH_EAST},
+}
+
+
+def start_tile(grid: ByteGrid, start: int) -> Tile:
+    """The tile under S, from which of its neighbours connect back to it."""
+    # Cells off the edge of the grid aren't in the table, so they're ground
+    around = set(grid.neighbour_table(diagonal=False)[start])
+    connects = []
+    for direction, tiles in connects_back.items():
+        cell = start + grid.stride * direction.y + direction.x
+        connects.append(cell in around and Tile(grid[cell]) in tiles)
+    north, east, south, west = connects
+    return start_tiles[north, east, south, west]
+
+
+def inside_shape(grid: ByteGrid, shape: Collection[int], cell: int) -> bool:
     """Crossing number algorithm"""
-    if point in shape:
+    if cell in shape:
         return False
 
-    diag = Vector(1, 1)
-    glancing_corners = {Tile.SOUTH_WEST, Tile.NORTH_EAST}
+    glancing_corners = {Tile.SOUTH_WEST.value, Tile.NORTH_EAST.value}
 
+    y, x = divmod(cell, grid.stride)
     crosses = 0
-    while grid.in_bounds(point):
-        if point in shape and grid[point] not in glancing_corners:
+    # Cast the ray diagonally down and right, to the edge of the grid
+    for _ in range(min(grid.width - x, grid.height - y)):
+        if cell in shape and grid[cell] not in glancing_corners:
             crosses += 1
-        point += diag
+        cell += grid.stride + 1
 
     return crosses % 2 == 1
 
 
-@register(day=10)
-def solve(file: IO[str], verbose: int) -> None:
-    grid = Grid([[Tile(c) for c in line.rstrip()] for line in file])
-    start: Vector[int] | None = None
-    graph: dict[Vector[int], set[Vector[int]]] = dict()
-    for y, row in enumerate(grid):
-        for x, tile in enumerate(row):
-            pos = Vector(x, y)
-            if tile is Tile.START:
-                north = pos + NORTH
-                east = pos + EAST
-                south = pos + SOUTH
-                west = pos + WEST
-                connects_north = grid[north] in {
-                    Tile.VERTICAL,
-                    Tile.SOUTH_EAST,
-                    Tile.SOUTH_WEST,
-                }
-                connects_east = grid[east] in {
-                    Tile.HORIZONTAL,
-                    Tile.NORTH_WEST,
-                    Tile.SOUTH_WEST,
-                }
-                connects_south = grid[south] in {
-                    Tile.VERTICAL,
-                    Tile.NORTH_EAST,
-                    Tile.NORTH_WEST,
-                }
-                connects_west = grid[west] in {
-                    Tile.HORIZONTAL,
-                    Tile.NORTH_EAST,
-                    Tile.SOUTH_EAST,
-                }
-
-                start = pos
-                grid[pos] = start_tiles[
-                    connects_north, connects_east, connects_south, connects_west
-                ]
-
-            graph[pos] = {pos + direction for direction in directions[grid[pos]]}
-
-    seen: set[Vector[int]] = set()
-    assert start is not None
-    queue = deque([start])
-
-    while queue:
-        pos = queue.popleft()
-        for neighbour in graph[pos]:
-            if neighbour not in seen:
-                queue.append(neighbour)
-                seen.add(neighbour)
-
-    print("Part 1:", len(seen) // 2)
-
-    inside = 0
-    for y, row in enumerate(grid):
-        for x, tile in enumerate(row):
-            pos = Vector(x, y)
-            if pos in seen:
-                continue
-
-            if inside_shape(grid, seen, pos):
-                inside += 1
-
-    print("Part 2:", inside)
+@register(day=10, buffer=True)
+def solve(data: InputBuffer, verbose: int) -> None:
+    with span("parse"):
+        grid = ByteGrid.from_bytes(data)
+
+    with span("build graph"):
+        # Graph of flat cell indices
+        steps = {
+            tile: [grid.stride * direction.y + direction.x for direction in tile_dirs]
+            for tile, tile_dirs in directions.items()
+        }
+        start: int | None = None
+        graph: dict[int, set[int]] = dict()
+        for y in range(grid.height):
+            row = y * grid.stride
+            for cell in range(row, row + grid.width):
+                tile = Tile(grid[cell])
+                if tile is Tile.START:
+                    start = cell
+                    tile = start_tile(grid, cell)
+                    grid[cell] = tile.value
+                graph[cell] = {cell + step for step in steps[tile]}
+
+    with span("part 1"):
+        seen: set[int] = set()
+        assert start is not None
+        queue = deque([start])
+
+        while queue:
+            cell = queue.popleft()
+            for neighbour in graph[cell]:
+                if neighbour not in seen:
+                    queue.append(neighbour)
+                    seen.add(neighbour)
+
+        count("bfs nodes", len(seen))
+        print("Part 1:", len(seen) // 2)
+
+    with span("part 2"):
+        inside = 0
+        for y in range(grid.height):
+            row = y * grid.stride
+            for cell in range(row, row + grid.width):
+                if inside_shape(grid, seen, cell):
+                    inside += 1
+
+        print("Part 2:", inside)
@@ -1,9 +1,10 @@
 from collections.abc import Iterator
 from itertools import combinations
-from typing import IO
 
-from ._registry import register
-from ._util import Grid, Vector
+import numpy as np
+
+from ._registry import InputBuffer, register
+from ._util import Vector
 
 
 def between(a: int, b: int) -> Iterator[int]:
@@ -12,20 +13,32 @@ def between(a: int, b: int) -> Iterator[int]:
     return iter(range(a, b + 1))
 
 
-@register(day=11)
-def solve(file: IO[str], verbose: int) -> None:
-    grid = Grid([list(line.rstrip()) for line in file])
-    empty_rows = {y for y, row in enumerate(grid.rows()) if all(c == "." for c in row)}
-    empty_cols = {
-        x for x, col in enumerate(grid.columns()) if all(c == "." for c in col)
-    }
+def find_galaxies(data: InputBuffer) -> tuple[list[Vector[int]], int, int]:
+    """Return galaxy positions and the width and height of the image.
+
+    Rows all have the same length, so positions come straight from offsets
+    in the input without splitting it into lines.
+    """
+    width = data.find(b"\n")
+    if width == -1:
+        width = len(data)
+    stride = width + 1
+    height = (len(data) + 1) // stride
+
+    galaxies = []
+    offset = data.find(b"#")
+    while offset != -1:
+        y, x = divmod(offset, stride)
+        galaxies.append(Vector(x, y))
+        offset = data.find(b"#", offset + 1)
+    return galaxies, width, height
 
-    galaxies = set()
-    for y, row in enumerate(grid):
-        for x, tile in enumerate(row):
-            pos = Vector(x, y)
-            if tile == "#":
-                galaxies.add(pos)
+
+@register(day=11, buffer=True)
+def solve(data: InputBuffer, verbose: int) -> None:
+    galaxies, width, height = find_galaxies(data)
+    empty_rows = set(range(height)) - {galaxy.y for galaxy in galaxies}
+    empty_cols = set(range(width)) - {galaxy.x for galaxy in galaxies}
 
     def distances(*, expansion: int = 2) -> Iterator[int]:
         for a, b in combinations(galaxies, 2):
@@ -38,3 +51,32 @@ def solve(file: IO[str], verbose: int) -> None:
 
     print("Part 1:", sum(distances()))
     print("Part 2:", sum(distances(expansion=1000000)))
+
+
+def expanded_distances(coords: np.ndarray, size: int, expansion: int) -> int:
+    """Sum of distances between every pair of coordinates along one axis,
+    where each empty row or column counts as expansion rows or columns.
+    """
+    empty = np.bincount(coords, minlength=size) == 0
+    expanded = coords + np.cumsum(empty)[coords] * (expansion - 1)
+    expanded.sort()
+    # Each coordinate is subtracted from those after it and added to those
+    # before it
+    n = len(expanded)
+    return int(np.sum(expanded * (2 * np.arange(n) - n + 1)))
+
+
+@register(day=11, buffer=True, backend="numpy")
+def solve_numpy(data: InputBuffer, verbose: int) -> None:
+    image = np.frombuffer(data, dtype=np.uint8)
+    width = data.find(b"\n")
+    if width == -1:
+        width = len(data)
+    stride = width + 1
+    height = (len(data) + 1) // stride
+    ys, xs = np.divmod(np.flatnonzero(image == ord("#")), stride)
+
+    for part, expansion in [(1, 2), (2, 1000000)]:
+        x_distances = expanded_distances(xs, width, expansion)
+        y_distances = expanded_distances(ys, height, expansion)
+        print(f"Part {part}:", x_distances + y_distances)
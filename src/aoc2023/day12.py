@@ -1,15 +1,17 @@
 from collections.abc import Iterable, Iterator
-from functools import lru_cache
 from typing import IO
 
 from ._registry import register
+from ._util import memoize
 
 type Springs = str
 type Groups = tuple[int, ...]
 type Record = tuple[Springs, Groups]
 
 
-@lru_cache
+# Sub-problems are only shared within a record, so the cache only lives for
+# one record
+@memoize(scope="call")
 def arrangements(springs: Springs, groups: Groups) -> int:
     if not springs:
         if groups:
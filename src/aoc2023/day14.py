@@ -1,8 +1,7 @@
-from collections import deque
-from functools import cache
 from typing import IO
 
 from ._registry import register
+from ._util import count, find_cycle, span
 
 
 def rotate(lines: list[str]) -> list[str]:
@@ -46,42 +45,41 @@ def print_columns(columns: list[str]) -> None:
 
 @register(day=14)
 def solve(file: IO[str], verbose: int) -> None:
-    lines = [line.rstrip() for line in file]
-    initial_columns = list("".join(col) for col in zip(*lines))
-
-    columns = initial_columns.copy()
-    for i, column in enumerate(columns):
-        columns[i] = tilt(column)
-
-    print("Part 1:", calculate_load(columns))
-
-    columns = initial_columns.copy()
-    column_cycles = dict()
-    cycle = 0
-    cycles = 1000000000
-    found = False
-    while cycle < cycles:
-        for _ in range(4):
-            for i, column in enumerate(columns):
-                columns[i] = tilt(column)
-            columns = rotate(columns)
-
-        if verbose >= 3:
-            print(f"After {cycle + 1} cycle{'s' if cycle > 1 else ''}:")
-            print_columns(columns)
-            print(f"load={calculate_load(columns)}")
-            print()
-
-        if not found:
-            key = format_columns(columns)
-            if key in column_cycles:
-                found = True
-                first_cycle = column_cycles[key]
-                remaining_cycles = cycles - cycle
-                cycle_length = cycle - first_cycle
-                cycle = cycles - (remaining_cycles % cycle_length)
-            else:
-                column_cycles[key] = cycle
-        cycle += 1
-
-    print("Part 2:", calculate_load(columns))
+    with span("parse"):
+        lines = [line.rstrip() for line in file]
+        initial_columns = list("".join(col) for col in zip(*lines))
+
+    with span("part 1"):
+        columns = initial_columns.copy()
+        for i, column in enumerate(columns):
+            columns[i] = tilt(column)
+
+        print("Part 1:", calculate_load(columns))
+
+    with span("part 2"):
+        simulated = 0
+
+        def spin_cycle(columns: tuple[str, ...]) -> tuple[str, ...]:
+            nonlocal simulated
+            tilted = list(columns)
+            for _ in range(4):
+                tilted = rotate([tilt(column) for column in tilted])
+            simulated += 1
+
+            if verbose >= 3:
+                print(f"After {simulated} cycle{'s' if simulated > 1 else ''}:")
+                print_columns(tilted)
+                print(f"load={calculate_load(tilted)}")
+                print()
+
+            return tuple(tilted)
+
+        cycle = find_cycle(
+            spin_cycle,
+            tuple(initial_columns),
+            1000000000,
+            key=lambda columns: "".join(columns).encode(),
+        )
+
+        count("cycles simulated", simulated)
+        print("Part 2:", calculate_load(list(cycle.state)))
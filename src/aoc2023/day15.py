@@ -4,6 +4,8 @@ from typing import IO
 
 from ._registry import register
 
+STEP = re.compile(r"([a-z]+)([-=])([0-9]*)")
+
 
 def hash_algo(s: str) -> int:
     current = 0
@@ -16,15 +18,16 @@ def hash_algo(s: str) -> int:
 
 @register(day=15)
 def solve(file: IO[str], verbose: int) -> None:
-    init_seq = next(file).rstrip().split(",")
+    line = next(file).rstrip()
+    init_seq = line.split(",")
     print("Part 1:", sum(hash_algo(step) for step in init_seq))
 
-    boxes: defaultdict[int, dict[str, int]] = defaultdict(dict)
-    for step in init_seq:
-        match = re.match(r"^([a-z]+)([-=])([0-9]+)?$", step)
-        assert match is not None
-        label, op, digits = match.groups()
+    # Tokenize every step in one pass
+    steps = STEP.findall(line)
+    assert len(steps) == len(init_seq)
 
+    boxes: defaultdict[int, dict[str, int]] = defaultdict(dict)
+    for step, (label, op, digits) in zip(init_seq, steps):
         box_num = hash_algo(label)
         box = boxes[box_num]
         match op:
@@ -32,7 +35,7 @@ def solve(file: IO[str], verbose: int) -> None:
                 if label in box:
                     del box[label]
             case "=":
-                assert digits is not None
+                assert digits
                 focal_length = int(digits)
                 box[label] = focal_length
 
@@ -1,13 +1,88 @@
+from collections import deque
 from typing import IO
 
-from ._registry import register
-from ._rust.day16 import Direction, fire_laser, max_edge_energized
-from ._util import Grid, Vector
+from ._registry import InputBuffer, register
+from ._util import Vector, count, span
+
+try:
+    from ._rust.day16 import Contraption, Direction, fire_laser, max_edge_energized
+except ImportError:
+    HAVE_RUST = False
+else:
+    HAVE_RUST = True
+
+# Directions are (dx, dy)
+RIGHT = (1, 0)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+UP = (0, -1)
+
+# Directions a beam travels in after hitting a tile, by incoming direction
+REFLECTIONS = {
+    "\\": {RIGHT: [DOWN], DOWN: [RIGHT], LEFT: [UP], UP: [LEFT]},
+    "/": {RIGHT: [UP], DOWN: [LEFT], LEFT: [DOWN], UP: [RIGHT]},
+    "|": {RIGHT: [UP, DOWN], DOWN: [DOWN], LEFT: [UP, DOWN], UP: [UP]},
+    "-": {RIGHT: [RIGHT], DOWN: [LEFT, RIGHT], LEFT: [LEFT], UP: [LEFT, RIGHT]},
+    ".": {RIGHT: [RIGHT], DOWN: [DOWN], LEFT: [LEFT], UP: [UP]},
+}
+
+type Beam = tuple[int, int, tuple[int, int]]
+
+
+def energized(rows: list[str], start: Beam) -> int:
+    width = len(rows[0])
+    height = len(rows)
+    queue = deque([start])
+    visited = set()
+    while queue:
+        beam = queue.popleft()
+        x, y, direction = beam
+        if not (0 <= x < width and 0 <= y < height) or beam in visited:
+            continue
+        visited.add(beam)
+        for dx, dy in REFLECTIONS[rows[y][x]][direction]:
+            queue.append((x + dx, y + dy, (dx, dy)))
+    count("beam states", len(visited))
+    # A position is energized if we've visited it
+    return len({(x, y) for x, y, _ in visited})
+
+
+def edge_beams(width: int, height: int) -> list[Beam]:
+    beams = []
+    for x in range(width):
+        beams.append((x, 0, DOWN))
+        beams.append((x, height - 1, UP))
+    for y in range(height):
+        beams.append((0, y, RIGHT))
+        beams.append((width - 1, y, LEFT))
+    return beams
 
 
 @register(day=16)
 def solve(file: IO[str], verbose: int) -> None:
-    grid = Grid([list(line.rstrip()) for line in file])
+    with span("parse"):
+        rows = [line.rstrip() for line in file]
+
+    with span("part 1"):
+        print("Part 1:", energized(rows, (0, 0, RIGHT)))
+
+    with span("part 2"):
+        beams = edge_beams(len(rows[0]), len(rows))
+        print("Part 2:", max(energized(rows, beam) for beam in beams))
+
+
+def solve_rust(data: InputBuffer, verbose: int) -> None:
+    with span("parse"):
+        grid = Contraption(data)
+
+    with span("part 1"):
+        print("Part 1:", fire_laser(grid, Vector(0, 0), Direction.RIGHT))
+        count("lasers fired")
+
+    with span("part 2"):
+        print("Part 2:", max_edge_energized(grid))
+        count("lasers fired", 2 * (grid.width + grid.height))
+
 
-    print("Part 1:", fire_laser(grid, Vector(0, 0), Direction.RIGHT))
-    print("Part 2:", max_edge_energized(grid))
+if HAVE_RUST:
+    register(day=16, buffer=True, backend="rust")(solve_rust)
@@ -1,6 +1,4 @@
 // Note: I'm only using rust for day 2 because I wanted to refamiliarise myself with nom.
-use std::collections::hash_map::DefaultHasher;
-use std::hash::{Hash, Hasher};
 use std::str::FromStr;
 
 use nom::branch::alt;
@@ -11,8 +9,10 @@ use nom::error::ParseError;
 use nom::multi::separated_list0;
 use nom::sequence::{delimited, separated_pair, terminated, tuple};
 use nom::IResult;
+use pyo3::buffer::PyBuffer;
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
+use pyo3::types::PyBytes;
 use thiserror::Error;
 
 #[derive(Debug, PartialEq, Eq)]
@@ -43,9 +43,18 @@ enum Colour {
 #[pymethods]
 impl Colour {
     fn __hash__(&self) -> u64 {
-        let mut hasher = DefaultHasher::new();
-        self.hash(&mut hasher);
-        hasher.finish()
+        self.index() as u64
+    }
+}
+
+impl Colour {
+    /// Column of this colour in the arrays returned by parse_games
+    fn index(&self) -> usize {
+        match self {
+            Colour::Red => 0,
+            Colour::Green => 1,
+            Colour::Blue => 2,
+        }
     }
 }
 
@@ -101,18 +110,70 @@ fn game(input: &str) -> IResult<&str, Game> {
     Ok((input, Game { id: game_id, sets }))
 }
 
-#[pyfunction]
-fn parse_game(input: &str) -> PyResult<Game> {
+#[derive(Error, Debug)]
+#[error("invalid game")]
+struct InvalidGameError;
+
+impl From<InvalidGameError> for PyErr {
+    fn from(err: InvalidGameError) -> Self {
+        PyValueError::new_err(err.to_string())
+    }
+}
+
+fn parse_line(input: &str) -> Result<Game, InvalidGameError> {
     match terminated(game, multispace0)(input) {
         Ok(("", game)) => Ok(game),
-        Ok(_) | Err(_) => Err(PyValueError::new_err("invalid game")),
+        Ok(_) | Err(_) => Err(InvalidGameError),
     }
 }
 
+#[pyfunction]
+fn parse_game(input: &str) -> PyResult<Game> {
+    Ok(parse_line(input)?)
+}
+
+/// Game id and the most cubes of each colour shown at once, for each game.
+fn game_maxima(input: &str) -> Result<Vec<[u32; 4]>, InvalidGameError> {
+    input
+        .lines()
+        .filter(|line| !line.trim().is_empty())
+        .map(|line| {
+            let game = parse_line(line)?;
+            let mut row = [game.id, 0, 0, 0];
+            for set in &game.sets {
+                let mut hand = [0; 3];
+                for (num, colour) in set {
+                    hand[colour.index()] += num;
+                }
+                for (max, num) in row[1..].iter_mut().zip(hand) {
+                    *max = (*max).max(num);
+                }
+            }
+            Ok(row)
+        })
+        .collect()
+}
+
+/// Parse every game in the input at once, returning rows of (id, red, green,
+/// blue) maxima as little-endian u32s, for numpy.frombuffer.
+#[pyfunction]
+fn parse_games<'py>(py: Python<'py>, data: PyBuffer<u8>) -> PyResult<&'py PyBytes> {
+    let data = data.to_vec(py)?;
+    let input = std::str::from_utf8(&data).map_err(|_| InvalidGameError)?;
+    let rows = game_maxima(input)?;
+    let bytes: Vec<u8> = rows
+        .iter()
+        .flatten()
+        .flat_map(|num| num.to_le_bytes())
+        .collect();
+    Ok(PyBytes::new(py, &bytes))
+}
+
 pub fn create_submodule<'a>(py: Python<'a>, m: &'a PyModule) -> PyResult<&'a PyModule> {
     let submodname = format!("{}.day02", m.name()?);
     let submod = PyModule::new(py, &submodname)?;
     submod.add_function(wrap_pyfunction!(parse_game, submod)?)?;
+    submod.add_function(wrap_pyfunction!(parse_games, submod)?)?;
     submod.add_class::<Colour>()?;
     submod.add_class::<Game>()?;
 
@@ -146,4 +207,14 @@ mod test {
             ))
         );
     }
+    #[test]
+    fn maxima() {
+        let input = "Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green\n\
+                     Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue\n";
+        assert_eq!(
+            game_maxima(input).unwrap(),
+            vec![[1, 4, 2, 6], [2, 1, 3, 4]]
+        );
+        assert!(game_maxima("Game 1: 3 purple\n").is_err());
+    }
 }
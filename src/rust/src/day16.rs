@@ -2,9 +2,9 @@ use std::collections::VecDeque;
 use std::num::TryFromIntError;
 use std::ops::Add;
 
+use pyo3::buffer::PyBuffer;
 use pyo3::exceptions::PyValueError;
 use pyo3::prelude::*;
-use rustc_hash::{FxHashMap, FxHashSet};
 use thiserror::Error;
 
 #[derive(Copy, Clone, Debug, Hash, Eq, PartialEq, FromPyObject)]
@@ -30,11 +30,15 @@ impl Vector {
     }
 }
 
-#[derive(Clone, Debug, FromPyObject)]
-struct Grid {
-    #[pyo3(attribute("_grid"))]
-    grid: Vec<Vec<char>>,
+/// The contraption's tiles, parsed once from the input so that it can be
+/// passed to each beam query without converting it again.
+#[pyclass(frozen)]
+#[derive(Clone, Debug)]
+struct Contraption {
+    tiles: Vec<u8>,
+    #[pyo3(get)]
     width: usize,
+    #[pyo3(get)]
     height: usize,
 }
 
@@ -54,14 +58,57 @@ impl From<BoundsError> for PyErr {
     }
 }
 
-impl Grid {
-    fn get(&self, loc: &Vector) -> Result<&char, BoundsError> {
+#[derive(Error, Debug)]
+#[error("rows must all have the same length")]
+struct RaggedRowsError;
+
+impl From<RaggedRowsError> for PyErr {
+    fn from(err: RaggedRowsError) -> Self {
+        PyValueError::new_err(err.to_string())
+    }
+}
+
+#[pymethods]
+impl Contraption {
+    #[new]
+    fn py_new(py: Python<'_>, data: PyBuffer<u8>) -> PyResult<Self> {
+        Ok(Self::parse(&data.to_vec(py)?)?)
+    }
+}
+
+impl Contraption {
+    fn parse(data: &[u8]) -> Result<Self, RaggedRowsError> {
+        let mut tiles = Vec::with_capacity(data.len());
+        let mut width = None;
+        let mut height = 0;
+        for line in data.split(|&b| b == b'\n') {
+            let line = line.strip_suffix(b"\r").unwrap_or(line);
+            if line.is_empty() {
+                continue;
+            }
+            match width {
+                None => width = Some(line.len()),
+                Some(width) if width != line.len() => return Err(RaggedRowsError),
+                Some(_) => {}
+            }
+            tiles.extend_from_slice(line);
+            height += 1;
+        }
+        Ok(Self {
+            tiles,
+            width: width.unwrap_or(0),
+            height,
+        })
+    }
+
+    fn index(&self, loc: &Vector) -> Result<usize, BoundsError> {
         let y: usize = loc.y.try_into()?;
         let x: usize = loc.x.try_into()?;
-        self.grid
-            .get(y)
-            .and_then(|row| row.get(x))
-            .ok_or(BoundsError)
+        if x < self.width && y < self.height {
+            Ok(y * self.width + x)
+        } else {
+            Err(BoundsError)
+        }
     }
 }
 
@@ -84,6 +131,10 @@ impl Direction {
         matches!(self, Self::Left | Self::Right)
     }
 
+    fn bit(self) -> u8 {
+        1 << self as u8
+    }
+
     fn to_vec(self) -> Vector {
         match self {
             Direction::Right => Vector::new(1, 0),
@@ -96,23 +147,31 @@ impl Direction {
 
 #[pyfunction]
 #[pyo3(name = "fire_laser")]
-fn fire_laser_py(grid: Grid, pos: Vector, direction: Direction) -> usize {
+fn fire_laser_py(grid: PyRef<'_, Contraption>, pos: Vector, direction: Direction) -> usize {
     fire_laser(&grid, pos, direction)
 }
 
-fn fire_laser(grid: &Grid, pos: Vector, direction: Direction) -> usize {
+fn fire_laser(grid: &Contraption, pos: Vector, direction: Direction) -> usize {
     let mut queue = VecDeque::from([(pos, direction)]);
-    let mut visited = FxHashMap::<Vector, FxHashSet<Direction>>::default();
+    // Bitmask of the directions each tile has been entered in
+    let mut visited = vec![0u8; grid.tiles.len()];
+    let mut energized = 0;
     while let Some((pos, direction)) = queue.pop_front() {
-        let tile = match grid.get(&pos) {
-            Ok(tile) => tile,
+        let index = match grid.index(&pos) {
+            Ok(index) => index,
             Err(BoundsError) => continue,
         };
-        if !visited.entry(pos).or_default().insert(direction) {
+        let seen = &mut visited[index];
+        if *seen & direction.bit() != 0 {
             continue;
         }
-        match tile {
-            '\\' => {
+        // A position is energized if we've visited it
+        if *seen == 0 {
+            energized += 1;
+        }
+        *seen |= direction.bit();
+        match grid.tiles[index] {
+            b'\\' => {
                 let direction = match direction {
                     Direction::Right => Direction::Down,
                     Direction::Down => Direction::Right,
@@ -121,7 +180,7 @@ fn fire_laser(grid: &Grid, pos: Vector, direction: Direction) -> usize {
                 };
                 queue.push_back((pos + direction.to_vec(), direction));
             }
-            '/' => {
+            b'/' => {
                 let direction = match direction {
                     Direction::Right => Direction::Up,
                     Direction::Down => Direction::Left,
@@ -130,11 +189,11 @@ fn fire_laser(grid: &Grid, pos: Vector, direction: Direction) -> usize {
                 };
                 queue.push_back((pos + direction.to_vec(), direction));
             }
-            '|' if direction.horizontal() => {
+            b'|' if direction.horizontal() => {
                 queue.push_back((pos + Direction::Up.to_vec(), Direction::Up));
                 queue.push_back((pos + Direction::Down.to_vec(), Direction::Down));
             }
-            '-' if direction.vertical() => {
+            b'-' if direction.vertical() => {
                 queue.push_back((pos + Direction::Left.to_vec(), Direction::Left));
                 queue.push_back((pos + Direction::Right.to_vec(), Direction::Right));
             }
@@ -143,12 +202,11 @@ fn fire_laser(grid: &Grid, pos: Vector, direction: Direction) -> usize {
             }
         }
     }
-    // A position is energized if we've visited it
-    visited.len()
+    energized
 }
 
 #[pyfunction]
-fn max_edge_energized(grid: Grid) -> usize {
+fn max_edge_energized(grid: PyRef<'_, Contraption>) -> usize {
     let mut configurations = Vec::with_capacity(grid.width * grid.height);
     for x in 0..grid.width {
         configurations.push((Vector::new(x as i32, 0), Direction::Down));
@@ -176,6 +234,7 @@ pub fn create_submodule<'a>(py: Python<'a>, m: &'a PyModule) -> PyResult<&'a PyM
     let submod = PyModule::new(py, &submodname)?;
     submod.add_function(wrap_pyfunction!(fire_laser_py, submod)?)?;
     submod.add_function(wrap_pyfunction!(max_edge_energized, submod)?)?;
+    submod.add_class::<Contraption>()?;
     submod.add_class::<Direction>()?;
 
     py.import("sys")?
@@ -184,3 +243,36 @@ pub fn create_submodule<'a>(py: Python<'a>, m: &'a PyModule) -> PyResult<&'a PyM
 
     Ok(submod)
 }
+
+#[cfg(test)]
+mod test {
+    use super::*;
+
+    const EXAMPLE: &[u8] = br".|...\....
+|.-.\.....
+.....|-...
+........|.
+..........
+.........\
+..../.\\..
+.-.-/..|..
+.|....-|.\
+..//.|....
+";
+
+    #[test]
+    fn parse_contraption() {
+        let grid = Contraption::parse(EXAMPLE).unwrap();
+        assert_eq!((grid.width, grid.height), (10, 10));
+        assert_eq!(grid.tiles[grid.index(&Vector::new(1, 0)).unwrap()], b'|');
+        assert!(grid.index(&Vector::new(10, 0)).is_err());
+        assert!(grid.index(&Vector::new(0, -1)).is_err());
+        assert!(Contraption::parse(b"..\n.\n").is_err());
+    }
+
+    #[test]
+    fn energized() {
+        let grid = Contraption::parse(EXAMPLE).unwrap();
+        assert_eq!(fire_laser(&grid, Vector::new(0, 0), Direction::Right), 46);
+    }
+}
@@ -0,0 +1,57 @@
+import random
+import re
+
+import pytest
+
+from aoc2023.day01 import digit_scanner, digit_words, word_scanner
+
+# The regex scan the automaton replaced, with a lookahead so that
+# overlapping words are all found
+DIGIT = re.compile(f"(?=(\\d|{'|'.join(digit_words)}))")
+
+LINES = [
+    # Overlapping words, where the last digit shares letters with another
+    "twone",
+    "eightwo",
+    "oneight",
+    "xtwone3four",
+    "sevenine",
+    "eighthree",
+    "zoneight234",
+    "7pqrstsixteen",
+    # Digits without words
+    "1",
+    "12",
+    "1abc2",
+    "treb7uchet",
+    "a1b2c3d4e5f",
+]
+
+
+def regex_value(line: str, *, words: bool) -> int:
+    found = [
+        digit_words.get(match, match)
+        for match in DIGIT.findall(line)
+        if words or match.isdigit()
+    ]
+    return int(found[0] + found[-1])
+
+
+def check(line: str) -> None:
+    assert word_scanner.calibration_value(line) == regex_value(line, words=True)
+    if any(c.isdigit() for c in line):
+        assert digit_scanner.calibration_value(line) == regex_value(line, words=False)
+
+
+@pytest.mark.parametrize("line", LINES)
+def test_calibration_value(line: str) -> None:
+    check(line)
+
+
+def test_random_lines() -> None:
+    rng = random.Random(0)
+    pieces = [*digit_words, *"0123456789", *"abcdefghijklmnopqrstuvwxyz"]
+    for _ in range(1000):
+        # Ending in a digit, so part 2 always has one
+        line = "".join(rng.choices(pieces, k=rng.randint(1, 12)))
+        check(line + rng.choice("0123456789"))
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from aoc2023 import day02
+from aoc2023.day02 import BagIndex, GameMaxima
+
+
+# With and without room for the dense table
+@pytest.mark.parametrize("dense_cells", [1 << 20, 0])
+def test_bag_index_matches_brute_force(
+    monkeypatch: pytest.MonkeyPatch, dense_cells: int
+) -> None:
+    monkeypatch.setattr(day02, "DENSE_CELLS", dense_cells)
+    rng = np.random.default_rng(0)
+    games = GameMaxima(
+        rng.permutation(np.arange(1, 301)),
+        np.column_stack([rng.integers(0, high, 300) for high in [5, 40, 100]]),
+    )
+    bags = np.column_stack([rng.integers(-1, high + 1, 500) for high in [5, 40, 100]])
+
+    counts, id_sums = BagIndex(games).query(bags)
+
+    possible = (games.min_required <= bags[:, None, :]).all(axis=2)
+    assert (counts == possible.sum(axis=1)).all()
+    assert (id_sums == possible @ games.ids).all()
@@ -0,0 +1,17 @@
+import pytest
+
+from aoc2023._registry import solve_input
+
+# The second example from the puzzle, where S is on the left edge
+EDGE_START = b"""\
+..F7.
+.FJ|.
+SJ.L7
+|F--J
+LJ...
+"""
+
+
+def test_start_on_edge(capsys: pytest.CaptureFixture[str]) -> None:
+    solve_input(10, EDGE_START, 0)
+    assert capsys.readouterr().out.splitlines()[0] == "Part 1: 8"
@@ -0,0 +1,38 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+
+from aoc2023._download import InputCache, Status, fetch_inputs
+
+
+def test_failed_day_keeps_other_downloads(tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/2023/day/2/input":
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path == "/2023/day/3/input":
+            return httpx.Response(500)
+        return httpx.Response(200, text="input\n")
+
+    downloads = asyncio.run(
+        fetch_inputs(
+            [1, 2, 3, 4],
+            session="session",
+            base_url="http://aoc.test",
+            cache=InputCache(tmp_path, "session"),
+            concurrency=2,
+            retries=1,
+            backoff=0,
+            transport=httpx.MockTransport(handler),
+        )
+    )
+
+    assert [download.day for download in downloads] == [1, 2, 3, 4]
+    assert [download.status for download in downloads] == [
+        Status.DOWNLOADED,
+        Status.FAILED,
+        Status.FAILED,
+        Status.DOWNLOADED,
+    ]
+    assert downloads[0].text == "input\n"
+    assert "connection refused" in (downloads[1].error or "")
@@ -0,0 +1,16 @@
+from pathlib import Path
+
+from aoc2023._registry import MappedInput, read_input, text_file
+
+
+def test_text_file_rereads_mapped_input(tmp_path: Path) -> None:
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"one\ntwo\n")
+    with open(path, "rb") as file:
+        data = read_input(file)
+    assert isinstance(data, MappedInput)
+
+    # Each solve reads the input from the start, e.g. when benchmarking
+    for _ in range(2):
+        with text_file(data) as text:
+            assert text.readlines() == ["one\n", "two\n"]
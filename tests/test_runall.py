@@ -0,0 +1,42 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO
+
+import pytest
+
+from aoc2023 import _runall
+from aoc2023._registry import solvers
+
+
+def hang(file: IO[str], verbose: int) -> None:
+    # A loop in C, which SIGALRM can't interrupt
+    sum(range(10**15))
+
+
+def die(file: IO[str], verbose: int) -> None:
+    os._exit(1)
+
+
+@pytest.fixture
+def executor(monkeypatch: pytest.MonkeyPatch) -> ProcessPoolExecutor:
+    # Registered in the parent, so that forked workers have them
+    monkeypatch.setitem(solvers._registered, 98, {"python": hang})
+    monkeypatch.setitem(solvers._registered, 99, {"python": die})
+    monkeypatch.setattr(_runall, "GRACE_PERIOD", 0.2)
+    return ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork"))
+
+
+def test_hung_day_times_out(executor: ProcessPoolExecutor) -> None:
+    future = executor.submit(_runall.run_input, 98, b"", 0, 0.1)
+    result = _runall.wait_for_day(98, future, 0.1)
+    assert result.error is not None and "Timed out" in result.error
+    _runall.kill_workers(executor)
+    executor.shutdown(cancel_futures=True)
+
+
+def test_dead_worker_fails_day(executor: ProcessPoolExecutor) -> None:
+    future = executor.submit(_runall.run_input, 99, b"", 0, 1)
+    result = _runall.wait_for_day(99, future, 1)
+    assert result.error == "Worker process died"
+    executor.shutdown()
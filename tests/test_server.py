@@ -0,0 +1,63 @@
+import socket
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from aoc2023._server import Client, ServerRunning, SolverServer
+
+# Servers fork their workers while the previous test's connection threads
+# may still be finishing
+pytestmark = pytest.mark.filterwarnings(
+    "ignore:This process .* is multi-threaded:DeprecationWarning"
+)
+
+DAY6_EXAMPLE = b"""\
+Time:      7  15   30
+Distance:  9  40  200
+"""
+
+
+@pytest.fixture
+def socket_path(tmp_path: Path) -> Path:
+    return tmp_path / "solver.sock"
+
+
+@pytest.fixture
+def server(socket_path: Path) -> Iterator[SolverServer]:
+    server = SolverServer(socket_path, jobs=2, timeout=10, memory_limit=None)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_solve(server: SolverServer, socket_path: Path) -> None:
+    with Client(socket_path) as client:
+        result = client.solve(6, DAY6_EXAMPLE)
+    assert result.error is None
+    assert result.output == "Part 1: 288\nPart 2: 71503\n"
+
+
+def test_unknown_day(server: SolverServer, socket_path: Path) -> None:
+    with Client(socket_path) as client:
+        result = client.solve(25, b"")
+    assert result.error == "Day 25 is unimplemented!"
+
+
+def test_refuses_running_server(server: SolverServer, socket_path: Path) -> None:
+    with pytest.raises(ServerRunning):
+        SolverServer(socket_path, jobs=1, timeout=None, memory_limit=None)
+    # The running server still has its socket
+    with Client(socket_path) as client:
+        assert client.solve(25, b"").error is not None
+
+
+def test_replaces_stale_socket(socket_path: Path) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(socket_path))
+    server = SolverServer(socket_path, jobs=1, timeout=None, memory_limit=None)
+    server.server_close()
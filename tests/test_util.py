@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+from aoc2023._util import (
+    ByteGrid,
+    ints,
+    memoize,
+    reset_memo_stats,
+    write_memo_stats,
+)
+
+
+@pytest.mark.parametrize("data", [b"ab\ncd\n", b"ab\ncd", b"ab\r\ncd\r\n", b"ab\r\ncd"])
+def test_byte_grid_line_endings(data: bytes) -> None:
+    grid = ByteGrid.from_bytes(data)
+    assert (grid.width, grid.height) == (2, 2)
+    assert list(grid) == ["ab", "cd"]
+
+
+def test_memoize_stats() -> None:
+    @memoize(scope="call")
+    def fib(n: int) -> int:
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    @memoize(maxsize=2)
+    def double(n: int) -> int:
+        return n * 2
+
+    reset_memo_stats()
+    assert fib(20) == 6765
+    # Each of 0 to 20 is computed once, and 2 to 19 are also looked up again
+    assert (fib.stats.misses, fib.stats.hits, fib.stats.peak_entries) == (21, 18, 21)
+
+    # Hit 1, then evict 2 for 3 and 1 for 2
+    for n in [1, 2, 1, 3, 2]:
+        double(n)
+    double.cache_clear()
+    double(1)
+    # Counts of caches in use are added when the stats are written
+    write_memo_stats(io.StringIO())
+    stats = double.stats
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 5, 2)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1 -2\n3", [1, -2, 3]),
+        # Stray hyphens take the regex path, which must agree on signs
+        ("seed-to-soil 1-2 -3", [1, 2, -3]),
+        (b"x=-5, y=10-12", [-5, 10, 12]),
+    ],
+)
+def test_ints(text: str | bytes, expected: list[int]) -> None:
+    assert ints(text) == expected